@@ -3,18 +3,39 @@
 File Name  : fa_metrics_systemhealth.py
 Purpose    : Collect system health metrics (CPU, Memory, Disk, Uptime)
 Platforms  : Windows, Linux, macOS
-Dependency : psutil
+Dependency : psutil (optional on Linux with the /proc backend; pandas optional, used only for the final report table)
 """
 
 
-import psutil
+try:
+    import psutil
+except ImportError:                     # Linux /proc backend and the /proc-based collectors still work
+    psutil = None
 import platform
+import re
+import select
 import socket
 import os
 import sys
-import pandas as pd
+import signal
+import threading
+import queue
+from concurrent.futures import Future, wait
 import time
-from datetime import datetime, timedelta
+import argparse
+import asyncio
+import configparser
+import csv
+import heapq
+import math
+import json
+import mmap
+import struct
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
 
 
 # ------------------------------------------------------------
@@ -84,189 +105,2919 @@ def check_permissions(log_dir):
 
 
 # ------------------------------------------------------------
-# Cleanup Activity Logs Older Than 30 Days | Optional
+# Activity Log | one segment per day (split further at ACTIVITY_LOG_MAX_BYTES), header block once per segment
 # ------------------------------------------------------------
-def cleanup_old_logs(log_dir, retention_days=30):
-    cutoff_date = datetime.now() - timedelta(days=retention_days)
-    for file_name in os.listdir(log_dir):
-        file_path = os.path.join(log_dir, file_name)
-        if os.path.isfile(file_path):
-            file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            if file_time < cutoff_date:
-                os.remove(file_path)
+ACTIVITY_LOG_MAX_BYTES = 10 * 1024 * 1024
 
 
+def activity_log_header(run_time, hostname, os_type, os_version, python_version, columns):
+    return (
+        "=" * 90 + "\n"
+        + "\nFA Sensor Health Log\n"
+        + "=" * 90 + "\n"
+        + f"Script Run Time : {run_time}\n"
+        + f"Hostname        : {hostname}\n"
+        + f"OS Type         : {os_type}\n"
+        + f"OS Version      : {os_version}\n"
+        + f"Python Version  : {python_version}\n\n"
+        + " | ".join(columns) + "\n"
+    )
+
+
+class ActivityLog:
+    def __init__(self, log_dir, hostname, header, max_bytes=ACTIVITY_LOG_MAX_BYTES, on_new_segment=None):
+        self.log_dir = log_dir
+        self.hostname = hostname
+        self.header = header
+        self.max_bytes = max_bytes
+        self.on_new_segment = on_new_segment
+        self._file = None
+        self._date = None
+        self._part = 0
+
+    def segment_path(self, date, part):
+        suffix = f"_{part}" if part else ""
+        return os.path.join(self.log_dir, f"{date}_{self.hostname}_SystemHealth_Log{suffix}.txt")
+
+    def _open(self, date, part):
+        if self._file is not None:
+            self._file.close()
+        while (os.path.exists(self.segment_path(date, part))
+               and os.path.getsize(self.segment_path(date, part)) >= self.max_bytes):
+            part += 1
+        self._date, self._part = date, part
+        self._file = open(self.segment_path(date, part), "a")
+        self._file.write(self.header)                                                   # Once per segment (per run)
+        if self.on_new_segment is not None:
+            self.on_new_segment(self._file.name)
+
+    # Lines of one sample, kept in the same segment; flush=False leaves flushing to the caller's batch
+    def write_entries(self, timestamp, lines, flush=True):
+        date = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+        if self._file is None or date != self._date:
+            self._open(date, 0)
+        elif self._file.tell() >= self.max_bytes:
+            self._open(date, self._part + 1)
+        self._file.write("".join(line + "\n" for line in lines))
+        if flush:
+            self._file.flush()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ------------------------------------------------------------
+# Retention Engine | Activity Logs Older Than 30 Days
+#   time-ordered heap of (expiry, path), seeded once with os.scandir, only the expired head is examined
+# ------------------------------------------------------------
+RETENTION_DAYS = 30
+RETENTION_CHECK_SECONDS = 3600          # Retention runs hourly, not per sample
+
+
+class RetentionIndex:
+    def __init__(self, log_dir, retention_days=RETENTION_DAYS, check_interval_sec=RETENTION_CHECK_SECONDS):
+        self.log_dir = log_dir
+        self.retention_sec = retention_days * 86400
+        self.policies = {}                                                              # directory -> retention sec
+        self.check_interval_sec = check_interval_sec
+        self._heap = []
+        self._tracked = set()
+        self._next_check = time.monotonic()
+        self.removed = 0
+
+    def retention_for(self, path):
+        return self.policies.get(os.path.dirname(path), self.retention_sec)
+
+    def seed(self, directory=None):
+        with os.scandir(directory or self.log_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    self.track(entry.path, entry.stat(follow_symlinks=False).st_mtime)
+
+    # Directory with its own retention (e.g. a history / rollup tier store), seeded right away
+    def add_policy(self, directory, retention_days):
+        self.policies[directory] = retention_days * 86400
+        if os.path.isdir(directory):
+            self.seed(directory)
+
+    def track(self, path, mtime=None):
+        if path in self._tracked:
+            return
+        if mtime is None:
+            mtime = time.time()
+        self._tracked.add(path)
+        heapq.heappush(self._heap, (mtime + self.retention_for(path), path))
+
+    # Pops expired heap entries; a file modified since it was indexed is re-queued with its new expiry
+    def run(self, now=None):
+        now = time.time() if now is None else now
+        while self._heap and self._heap[0][0] <= now:
+            _, path = heapq.heappop(self._heap)
+            self._tracked.discard(path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime + self.retention_for(path) > now:
+                self.track(path, mtime)
+                continue
+            try:
+                os.remove(path)
+                self.removed += 1
+            except FileNotFoundError:
+                pass
+
+    # Retention changes (config reload) re-derive every expiry from the file's current mtime
+    def set_retention_days(self, retention_days, directory=None):
+        if directory is None:
+            self.retention_sec = retention_days * 86400
+        else:
+            self.policies[directory] = retention_days * 86400
+        entries, self._heap = self._heap, []
+        self._tracked.clear()
+        for _, path in entries:
+            try:
+                self.track(path, os.stat(path).st_mtime)
+            except FileNotFoundError:
+                pass
+        self._next_check = time.monotonic()
+
+    def maybe_run(self):
+        if time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval_sec
+            self.run()
+
+
+# ------------------------------------------------------------
+# Metric Sample Record | raw numbers, formatted only for display
+# ------------------------------------------------------------
+class MetricSample(NamedTuple):                                                         # None = metric not collected
+    timestamp: float                    # Epoch seconds
+    cpu_percent: Optional[float]
+    used_memory_bytes: Optional[int]
+    total_memory_bytes: Optional[int]
+    memory_percent: Optional[float]
+    used_disk_bytes: Optional[int]
+    total_disk_bytes: Optional[int]
+    disk_percent: Optional[float]
+    uptime_seconds: Optional[float]
+
+
+DISPLAY_COLUMNS = [
+    "Timestamp", "Hostname", "CPU usage %", "Used Memory", "Total Memory", "Memory usage %",
+    "Used Disk Space", "Total Disk Space", "Disk usage %", "uptime",
+]
+
+HISTORY_CSV_COLUMNS = [
+    "Timestamp", "Hostname", "CPU usage %", "Used Memory (bytes)", "Total Memory (bytes)", "Memory usage %",
+    "Used Disk Space (bytes)", "Total Disk Space (bytes)", "Disk usage %", "Uptime (s)",
+]
+
+GIB = 1024 ** 3
+MIB = 1024 ** 2
+
+METRIC_DISPLAY_FORMATS = (
+    lambda value: f"{round(value)}%",
+    lambda value: f"{value / GIB:.2f} GB",
+    lambda value: f"{value / GIB:.2f} GB",
+    lambda value: f"{value}%",
+    lambda value: f"{value / GIB:.2f} GB",
+    lambda value: f"{value / GIB:.2f} GB",
+    lambda value: f"{value}%",
+    lambda value: f"{int(value // 86400)} Days",
+)
+
+
+def format_timestamp(epoch):
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Console / activity log presentation of a sample (None, or a None field -> N/A)
+def format_sample(timestamp, hostname, sample):
+    values = sample[1:] if sample is not None else (None,) * len(METRIC_DISPLAY_FORMATS)
+    return [format_timestamp(timestamp), hostname] + [
+        "N/A" if value is None else formatter(value) for formatter, value in zip(METRIC_DISPLAY_FORMATS, values)
+    ]
+
+
+# CSV history row: raw numbers so downstream aggregation needs no string parsing
+def history_row(timestamp, hostname, sample):
+    values = sample[1:] if sample is not None else (None,) * len(METRIC_DISPLAY_FORMATS)
+    return [format_timestamp(timestamp), hostname] + ["" if value is None else value for value in values]
+
+
+# ------------------------------------------------------------
+# Move a history CSV written with the old (formatted text) header out of the way
+# ------------------------------------------------------------
+def archive_legacy_history(csv_path, columns):
+    if not os.path.exists(csv_path):
+        return
+    with open(csv_path, newline="") as f:
+        first_line = f.readline().rstrip("\r\n")
+    if first_line and first_line != ",".join(columns):
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        root, ext = os.path.splitext(csv_path)
+        os.rename(csv_path, f"{root}_legacy_{stamp}{ext}")
+
+
+# ------------------------------------------------------------
+# Streaming History Writer | CSV kept open across samples, flushed by row count / elapsed time
+# ------------------------------------------------------------
+HISTORY_FLUSH_ROWS = 60                 # Flush after this many buffered rows
+HISTORY_FLUSH_SECONDS = 5.0             # ... or when the oldest buffered row is this old (checked on write)
+
+
+class HistoryWriter:
+    def __init__(self, csv_path, columns, flush_rows=HISTORY_FLUSH_ROWS, flush_seconds=HISTORY_FLUSH_SECONDS):
+        self.csv_path = csv_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+        write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+        self._file = open(csv_path, "a", newline="", buffering=64 * 1024)
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(columns)
+            self.flush()
+        self.start_offset = self._file.tell()                                            # First byte written by this run
+
+    def write_row(self, row):
+        self._writer.writerow(row)
+        self._pending_rows += 1
+        if (self._pending_rows >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ------------------------------------------------------------
+# Background Writer | sampling hands every write (activity log, history, rollups, CSV, per-collector stores,
+#   retention) to one writer thread through a bounded queue, so a slow or saturated disk never delays a tick.
+#   Jobs are (kind, args) with JSON-friendly args, run in order by the sink registered for the kind; the thread
+#   drains everything queued per wake-up and calls the batch hooks (e.g. one activity log flush) once after.
+#   When the queue is full:
+#     drop-oldest : discard the oldest queued job (counted in dropped)
+#     block       : the sampling loop waits for room
+#     spill       : jobs go to a JSON-lines spill file, replayed in order once the queue has drained
+# ------------------------------------------------------------
+WRITE_QUEUE_JOBS = 1000
+OVERFLOW_POLICIES = ("drop-oldest", "block", "spill")
+
+
+class BackgroundWriter:
+    def __init__(self, max_jobs=WRITE_QUEUE_JOBS, policy="drop-oldest", spill_path=None):
+        if policy not in OVERFLOW_POLICIES or (policy == "spill" and not spill_path):
+            raise ValueError(f"overflow policy must be one of {', '.join(OVERFLOW_POLICIES)} (spill needs a path)")
+        if max_jobs < 1:
+            raise ValueError(f"writer queue size must be at least 1 job: {max_jobs}")
+        self.max_jobs = max_jobs
+        self.policy = policy
+        self.spill_path = spill_path
+        self.sinks = {}
+        self.batch_hooks = []
+        self.written = self.dropped = self.spilled = self.failed = self.max_depth = 0
+        self._jobs = deque()
+        self._spilling = bool(spill_path) and os.path.exists(spill_path)                # Left by an earlier run
+        self._busy = False
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="fa-writer", daemon=True)
+
+    def register(self, kind, sink):
+        self.sinks[kind] = sink
+
+    # After the sinks are registered (a left-over spill file is replayed first)
+    def start(self):
+        self._thread.start()
+
+    @property
+    def depth(self):
+        return len(self._jobs)
+
+    def submit(self, kind, *args):
+        with self._condition:
+            if self._spilling:
+                self._spill(kind, args)
+                return
+            if len(self._jobs) >= self.max_jobs:
+                if self.policy == "block":
+                    while len(self._jobs) >= self.max_jobs and self._thread.is_alive():
+                        self._condition.wait()
+                elif self.policy == "spill":
+                    self._spilling = True
+                    self._spill(kind, args)
+                    return
+                else:
+                    self._jobs.popleft()
+                    self.dropped += 1
+            self._jobs.append((kind, args))
+            self.max_depth = max(self.max_depth, len(self._jobs))
+            self._condition.notify_all()
+
+    def _spill(self, kind, args):
+        with open(self.spill_path, "a") as f:
+            f.write(json.dumps([kind, args]) + "\n")
+        self.spilled += 1
+        self._condition.notify_all()
+
+    def _execute(self, kind, args):
+        try:
+            self.sinks[kind](*args)
+            self.written += 1
+        except Exception as error_found:                                                # Keep draining
+            self.failed += 1
+            print(f"WARNING: {kind} write failed: {error_found}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs and not self._spilling and not self._closing:
+                    self._condition.wait()
+                if not self._jobs and not self._spilling:
+                    return                                                              # Closing and drained
+                batch, replay = list(self._jobs), None
+                self._jobs.clear()
+                if not batch and self._spilling:                                        # Queue drained: replay spill
+                    replay = self.spill_path + ".replay"
+                    os.replace(self.spill_path, replay)
+                    self._spilling = False
+                self._busy = True
+                self._condition.notify_all()
+            if replay is not None:
+                with open(replay) as f:
+                    for line in f:
+                        kind, args = json.loads(line)
+                        self._execute(kind, args)
+                os.remove(replay)
+            for kind, args in batch:
+                self._execute(kind, args)
+            for hook in self.batch_hooks:
+                hook()
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+    # Blocks until everything submitted so far (spill included) is written
+    def drain(self):
+        with self._condition:
+            while (self._jobs or self._spilling or self._busy) and self._thread.is_alive():
+                self._condition.wait()
+
+    def close(self):
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def summary(self):
+        return (f"Writer: {self.written} writes | Max queue depth: {self.max_depth}/{self.max_jobs} | "
+                f"Dropped: {self.dropped} | Spilled: {self.spilled} | Failed: {self.failed}")
+
+
+# ------------------------------------------------------------
+# Final Report | pandas imported lazily, plain text fallback
+# ------------------------------------------------------------
+def print_run_report(store_directory, run_start):
+    print(f" *** Metrics collected *** ")
+    rows = []
+    if run_start is not None:                                                           # Only rows from this run
+        rows = [history_row(timestamp, hostname, sample) + [describe_status(status)]
+                for timestamp, hostname, sample, status in iter_history(store_directory, run_start)]
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+
+    if pd is not None:
+        delta_row_added_df = pd.DataFrame(rows, columns=HISTORY_CSV_COLUMNS + ["Status"])
+        print(delta_row_added_df.to_string(index=False))
+        return
+    print(" | ".join(HISTORY_CSV_COLUMNS + ["Status"]))
+    for row in rows:
+        print(" | ".join(map(str, row)))
+
+
+# ------------------------------------------------------------
+# CPU Sampler | busy % over the whole period since the previous tick, from cpu_times() deltas
+# ------------------------------------------------------------
+def cpu_total_and_idle(times):
+    fields = times._asdict()
+    total = sum(fields.values()) - fields.get("guest", 0.0) - fields.get("guest_nice", 0.0)    # guest is already in user/nice
+    idle = fields["idle"] + fields.get("iowait", 0.0)
+    return total, idle
+
+
+def cpu_busy_percent(previous, current):
+    previous_total, previous_idle = cpu_total_and_idle(previous)
+    current_total, current_idle = cpu_total_and_idle(current)
+    total_delta = current_total - previous_total
+    if total_delta <= 0:
+        return 0.0
+    busy = 100.0 * (1.0 - (current_idle - previous_idle) / total_delta)
+    return min(max(busy, 0.0), 100.0)
+
+
+class CpuSampler:
+    def __init__(self):
+        self._previous = psutil.cpu_times()                                             # Baseline for the first tick
+
+    def sample(self):
+        current = psutil.cpu_times()
+        busy = cpu_busy_percent(self._previous, current)
+        self._previous = current
+        return busy
+
+
+# ------------------------------------------------------------
+# Optional Collection Modes | Optional
+# ------------------------------------------------------------
+ENABLE_PERCPU = False                   # Per-core busy % with user/system/iowait/steal/irq breakdown
+
+
+# ------------------------------------------------------------
+# Column Block File | header once, then blocks of column-major fixed-width arrays
+#   header : magic + one JSON line {"columns": [...], "types": [...], "byteorder": ..., "meta": {...}}
+#   block  : b"BLK0" + row count (uint32 LE), float64 epoch timestamps, then one array per column
+#            (array typecodes from "types", float32 when absent). Readable with zero parsing through
+#            iter_column_blocks() memoryviews, numpy.frombuffer() on those views, or numpy.memmap at the
+#            offsets reported by column_file_blocks().
+# ------------------------------------------------------------
+COLUMN_FILE_MAGIC = b"FACOL1\n"
+COLUMN_BLOCK_MAGIC = b"BLK0"
+COLUMN_BLOCK_HEADER = struct.Struct("<4sI")
+COLUMN_BLOCK_ROWS = 60
+
+
+def read_column_file_header(f):
+    if f.read(len(COLUMN_FILE_MAGIC)) != COLUMN_FILE_MAGIC:
+        raise ValueError(f"not a column block file: {f.name}")
+    header = json.loads(f.readline())
+    header.setdefault("types", ["f"] * len(header["columns"]))
+    header.setdefault("byteorder", sys.byteorder)
+    return header
+
+
+def column_block_size(header, rows):
+    return COLUMN_BLOCK_HEADER.size + rows * (8 + sum(array(t).itemsize for t in header["types"]))
+
+
+# Walks block headers only: [(block offset, rows)], plus the end of the last complete block
+def column_file_blocks(path, start_offset=None):
+    blocks = []
+    with open(path, "rb") as f:
+        header = read_column_file_header(f)
+        offset = f.tell() if start_offset is None else start_offset
+        size = os.fstat(f.fileno()).st_size
+        while offset + COLUMN_BLOCK_HEADER.size <= size:
+            f.seek(offset)
+            magic, rows = COLUMN_BLOCK_HEADER.unpack(f.read(COLUMN_BLOCK_HEADER.size))
+            if magic != COLUMN_BLOCK_MAGIC or offset + column_block_size(header, rows) > size:
+                break                                                                   # Torn tail from a crash
+            blocks.append((offset, rows))
+            offset += column_block_size(header, rows)
+    return header, blocks, offset
+
+
+# ------------------------------------------------------------
+# Sparse Block Index | <segment>.idx sidecar, one fixed-width record per block:
+#   first timestamp, last timestamp (float64), block offset (uint64), rows (uint32)
+# ------------------------------------------------------------
+COLUMN_INDEX_RECORD = struct.Struct("<ddQI")
+
+
+def column_index_path(path):
+    return path + ".idx"
+
+
+def rebuild_column_index(path):
+    header, blocks, _ = column_file_blocks(path)
+    with open(path, "rb") as f, open(column_index_path(path), "wb") as index:
+        for offset, rows in blocks:
+            f.seek(offset + COLUMN_BLOCK_HEADER.size)
+            timestamps = array("d")
+            timestamps.fromfile(f, rows)
+            if header["byteorder"] != sys.byteorder:
+                timestamps.byteswap()
+            index.write(COLUMN_INDEX_RECORD.pack(timestamps[0], timestamps[-1], offset, rows))
+
+
+# Index is trusted only if its last record ends exactly where the data file's last complete block ends
+def column_index_is_current(path, data_end):
+    index_path = column_index_path(path)
+    if not os.path.exists(index_path):
+        return False
+    size = os.path.getsize(index_path)
+    if size % COLUMN_INDEX_RECORD.size:
+        return False
+    with open(path, "rb") as f:
+        header = read_column_file_header(f)
+        if size == 0:
+            return f.tell() == data_end
+    with open(index_path, "rb") as index:
+        index.seek(size - COLUMN_INDEX_RECORD.size)
+        _, _, offset, rows = COLUMN_INDEX_RECORD.unpack(index.read(COLUMN_INDEX_RECORD.size))
+    return offset + column_block_size(header, rows) == data_end
+
+
+# Blocks overlapping [start_ts, end_ts): binary search over the index records, O(log n) reads
+def column_index_lookup(path, start_ts, end_ts):
+    index_path = column_index_path(path)
+    if not os.path.exists(index_path) or os.path.getsize(index_path) == 0:
+        return []
+    with open(index_path, "rb") as index, mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        count = len(mm) // COLUMN_INDEX_RECORD.size
+        low, high = 0, count
+        while low < high:                                                               # First block ending >= start
+            middle = (low + high) // 2
+            _, last_ts, _, _ = COLUMN_INDEX_RECORD.unpack_from(mm, middle * COLUMN_INDEX_RECORD.size)
+            if last_ts < start_ts:
+                low = middle + 1
+            else:
+                high = middle
+        blocks = []
+        for position in range(low, count):
+            first_ts, _, offset, rows = COLUMN_INDEX_RECORD.unpack_from(mm, position * COLUMN_INDEX_RECORD.size)
+            if first_ts >= end_ts:
+                break
+            blocks.append((offset, rows))
+    return blocks
+
+
+class ColumnBlockWriter:
+    def __init__(self, path, columns, meta=None, types=None, block_rows=COLUMN_BLOCK_ROWS, flush_seconds=None,
+                 indexed=False):
+        self.path = path
+        self.columns = list(columns)
+        self.types = list(types or ["f"] * len(self.columns))
+        self.block_rows = block_rows
+        self.flush_seconds = flush_seconds
+        self._timestamps = array("d")
+        self._values = [array(t) for t in self.types]
+        self._last_flush = time.monotonic()
+        header = {"columns": self.columns, "types": self.types, "byteorder": sys.byteorder, "meta": meta or {}}
+
+        valid_end = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            existing, _, valid_end = column_file_blocks(path)
+            if {k: existing[k] for k in header} != header:                              # e.g. core count changed
+                root, ext = os.path.splitext(path)
+                os.rename(path, f"{root}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}{ext}")
+                valid_end = None
+        self._file = open(path, "ab")
+        if valid_end is not None and valid_end < self._file.tell():
+            self._file.truncate(valid_end)
+            self._file.seek(valid_end)
+        if self._file.tell() == 0:
+            self._file.write(COLUMN_FILE_MAGIC + json.dumps(header).encode() + b"\n")
+            self._file.flush()
+        self.start_offset = self._file.tell()                                            # First block of this run
+
+        self._index = None
+        if indexed:
+            if not column_index_is_current(path, self.start_offset):
+                rebuild_column_index(path)
+            self._index = open(column_index_path(path), "ab")
+
+    def append(self, timestamp, values):
+        self._timestamps.append(timestamp)
+        for column, value in zip(self._values, values):
+            column.append(value)
+        if (len(self._timestamps) >= self.block_rows
+                or (self.flush_seconds is not None and time.monotonic() - self._last_flush >= self.flush_seconds)):
+            self.flush()
+
+    def flush(self):
+        if self._timestamps:
+            offset = self._file.tell()
+            self._file.write(COLUMN_BLOCK_HEADER.pack(COLUMN_BLOCK_MAGIC, len(self._timestamps)))
+            self._timestamps.tofile(self._file)
+            for column in self._values:
+                column.tofile(self._file)
+            if self._index is not None:
+                self._index.write(COLUMN_INDEX_RECORD.pack(
+                    self._timestamps[0], self._timestamps[-1], offset, len(self._timestamps)
+                ))
+            del self._timestamps[:]
+            for column in self._values:
+                del column[:]
+        self._file.flush()
+        if self._index is not None:
+            self._index.flush()                                                         # After the data it points at
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            if self._index is not None:
+                self._index.close()
+
+
+# Yields (timestamps, {column: values}) per block as memoryviews over an mmap - valid until the next block.
+# blocks: [(offset, rows)] from column_index_lookup(), otherwise every block from start_offset on.
+def iter_column_blocks(path, start_offset=None, blocks=None):
+    if blocks is None:
+        header, blocks, _ = column_file_blocks(path, start_offset)
+    else:
+        with open(path, "rb") as f:
+            header = read_column_file_header(f)
+    if not blocks:
+        return
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {header['byteorder']}-endian host; use read_column_file()")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            for offset, rows in blocks:
+                position = offset + COLUMN_BLOCK_HEADER.size
+                timestamps = view[position:position + 8 * rows].cast("d")
+                position += 8 * rows
+                values = {}
+                for name, typecode in zip(header["columns"], header["types"]):
+                    size = rows * array(typecode).itemsize
+                    values[name] = view[position:position + size].cast(typecode)
+                    position += size
+                yield timestamps, values
+                timestamps.release()
+                for column in values.values():
+                    column.release()
+        finally:
+            view.release()
+
+
+def read_column_file(path):
+    header, blocks, _ = column_file_blocks(path)
+    timestamps = array("d")
+    values = {name: array(typecode) for name, typecode in zip(header["columns"], header["types"])}
+    with open(path, "rb") as f:
+        for offset, rows in blocks:
+            f.seek(offset + COLUMN_BLOCK_HEADER.size)
+            timestamps.fromfile(f, rows)
+            for name in header["columns"]:
+                values[name].fromfile(f, rows)
+    if header["byteorder"] != sys.byteorder:
+        for column in [timestamps] + list(values.values()):
+            column.byteswap()
+    return header, timestamps, values
+
+
+# ------------------------------------------------------------
+# Columnar Segment Store | <directory>/<period>[_<part>].fcol, period from segment_format (daily by default)
+#   static fields (hostname, totals) live once in the segment header; a change of those starts a new part
+# ------------------------------------------------------------
+NAN = float("nan")
+
+
+def history_segment_sort_key(file_name):
+    stem = file_name[:-len(".fcol")]
+    period, _, part = stem.partition("_")
+    return period, int(part or 0)
+
+
+def history_segments(directory):
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory) if name.endswith(".fcol")]
+    return [os.path.join(directory, name) for name in sorted(names, key=history_segment_sort_key)]
+
+
+class SegmentStore:
+    def __init__(self, directory, columns, types, segment_format="%Y-%m-%d", block_rows=HISTORY_FLUSH_ROWS,
+                 flush_seconds=HISTORY_FLUSH_SECONDS, on_new_segment=None):
+        self.directory = directory
+        self.columns = tuple(columns)
+        self.types = tuple(types)
+        self.segment_format = segment_format
+        self.block_rows = block_rows
+        self.flush_seconds = flush_seconds
+        self.on_new_segment = on_new_segment
+        self.run_start = None                                                           # (segment path, offset)
+        self._writer = None
+        self._period = None
+        self._meta = None
+        os.makedirs(directory, exist_ok=True)
+
+    def segment_path(self, period, part):
+        return os.path.join(self.directory, f"{period}_{part}.fcol" if part else f"{period}.fcol")
+
+    def _open(self, period, meta):
+        self.close()
+        part = 0
+        while os.path.exists(self.segment_path(period, part + 1)):                      # Latest part of the period
+            part += 1
+        path = self.segment_path(period, part)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                existing = read_column_file_header(f)
+            if existing["meta"] != meta or existing["columns"] != list(self.columns):
+                path = self.segment_path(period, part + 1)
+        is_new = not os.path.exists(path)
+        self._writer = ColumnBlockWriter(
+            path, self.columns, meta=meta, types=self.types,
+            block_rows=self.block_rows, flush_seconds=self.flush_seconds, indexed=True,
+        )
+        self._period, self._meta = period, meta
+        if self.run_start is None:
+            self.run_start = (path, self._writer.start_offset)
+        if is_new and self.on_new_segment is not None:
+            self.on_new_segment(path)
+
+    def append_row(self, timestamp, values, meta):
+        period = datetime.fromtimestamp(timestamp).strftime(self.segment_format)
+        if self._writer is None or period != self._period or meta != self._meta:
+            self._open(period, meta)
+        self._writer.append(timestamp, values)
+
+    def set_flush_policy(self, block_rows, flush_seconds):
+        self.block_rows, self.flush_seconds = block_rows, flush_seconds
+        if self._writer is not None:
+            self._writer.block_rows, self._writer.flush_seconds = block_rows, flush_seconds
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# Yields (timestamp, segment meta, row values) either from a (segment, offset) position or for a
+# [start_ts, end_ts) window - the window seeks through the segment period names and the block index
+def iter_store_rows(directory, columns, start=None, start_ts=None, end_ts=None, segment_format="%Y-%m-%d"):
+    segments = history_segments(directory)
+    start_path, start_offset = start if start is not None else (None, None)
+    if start_path in segments:
+        segments = segments[segments.index(start_path):]
+    windowed = start_ts is not None or end_ts is not None
+    start_ts = float("-inf") if start_ts is None else start_ts
+    end_ts = float("inf") if end_ts is None else end_ts
+    if windowed:
+        first_period = datetime.fromtimestamp(max(start_ts, 0)).strftime(segment_format)
+        last_period = datetime.fromtimestamp(min(end_ts, 2 ** 32)).strftime(segment_format)
+        segments = [path for path in segments
+                    if first_period <= history_segment_sort_key(os.path.basename(path))[0] <= last_period]
+
+    for path in segments:
+        with open(path, "rb") as f:
+            meta = read_column_file_header(f)["meta"]
+        blocks = None
+        if windowed:
+            if not os.path.exists(column_index_path(path)):
+                rebuild_column_index(path)
+            blocks = column_index_lookup(path, start_ts, end_ts)
+        for timestamps, values in iter_column_blocks(path, start_offset if path == start_path else None, blocks):
+            block_columns = [values.get(name) for name in columns]                     # None: older segment
+            for row, timestamp in enumerate(timestamps):
+                if start_ts <= timestamp < end_ts:
+                    yield timestamp, meta, [None if column is None else column[row] for column in block_columns]
+
+
+# ------------------------------------------------------------
+# Columnar History Store | Metric_History_<host>/<date>[_<part>].fcol - raw samples
+# ------------------------------------------------------------
+HISTORY_STORE_COLUMNS = ("cpu_percent", "used_memory_bytes", "memory_percent", "used_disk_bytes", "disk_percent",
+                         "uptime_seconds")
+HISTORY_STORE_TYPES = ("f", "d", "f", "d", "f", "d")
+HISTORY_STORE_DECODE = {                # Back to the collector's types: whole bytes, float32 to 7 significant digits
+    "f": lambda value: float(f"{value:.7g}"),
+    "d": float,
+}
+HISTORY_STORE_BYTE_COLUMNS = ("used_memory_bytes", "used_disk_bytes")
+HISTORY_STORE_STATIC = ("total_memory_bytes", "total_disk_bytes")
+
+# Field status | one uint32 "status" column per row: bit (kind offset + i) for MetricSample value field i
+#   (cpu_percent = 0 ... uptime_seconds = 7). 0 = every collected field is a good reading.
+STATUS_FIELDS = MetricSample._fields[1:]
+STATUS_KINDS = {
+    "failed": 0,                        # Collector raised this tick
+    "late": 8,                          # Collector missed the tick deadline
+    "disabled": 16,                     # Collector backing off after failures
+    "unavailable": 24,                  # Collector returned no value (first CPU window, stale mount)
+}
+
+
+def field_status(fields, kind):
+    return sum(1 << (STATUS_KINDS[kind] + STATUS_FIELDS.index(name)) for name in fields)
+
+
+def describe_status(status):
+    return ", ".join(f"{name} {kind}" for kind, offset in STATUS_KINDS.items()
+                     for index, name in enumerate(STATUS_FIELDS) if status >> (offset + index) & 1)
+
+
+class HistoryStore(SegmentStore):
+    def __init__(self, directory, hostname, **kwargs):
+        super().__init__(directory, HISTORY_STORE_COLUMNS + ("status",), HISTORY_STORE_TYPES + ("I",), **kwargs)
+        self.hostname = hostname
+
+    def append(self, timestamp, sample, status=0):
+        previous = self._meta or {}
+        if sample is None:
+            meta = self._meta or {"hostname": self.hostname, **dict.fromkeys(HISTORY_STORE_STATIC)}
+            values = [NAN] * len(HISTORY_STORE_COLUMNS)
+        else:
+            meta = {"hostname": self.hostname, **{                                      # A failed reading keeps the
+                name: previous.get(name) if getattr(sample, name) is None else getattr(sample, name)    # segment
+                for name in HISTORY_STORE_STATIC
+            }}
+            values = [NAN if getattr(sample, name) is None else getattr(sample, name)
+                      for name in HISTORY_STORE_COLUMNS]
+        self.append_row(timestamp, values + [status], meta)
+
+
+# Rebuilds (timestamp, hostname, MetricSample, status) rows from the raw history store
+def iter_history(directory, start=None, start_ts=None, end_ts=None):
+    decoders = [int if name in HISTORY_STORE_BYTE_COLUMNS else HISTORY_STORE_DECODE[typecode]
+                for name, typecode in zip(HISTORY_STORE_COLUMNS, HISTORY_STORE_TYPES)]
+    columns = HISTORY_STORE_COLUMNS + ("status",)
+    for timestamp, meta, values in iter_store_rows(directory, columns, start, start_ts, end_ts):
+        fields = {name: (None if value != value else decode(value))                     # NaN -> None
+                  for name, value, decode in zip(HISTORY_STORE_COLUMNS, values, decoders)}
+        static = {name: meta.get(name) for name in HISTORY_STORE_STATIC}
+        status = values[-1] or 0                                                        # Older segments: no column
+        yield timestamp, meta.get("hostname", ""), MetricSample(timestamp=timestamp, **fields, **static), status
+
+
+def export_history_csv(directory, csv_path, start_ts=None, end_ts=None):
+    rows = 0
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HISTORY_CSV_COLUMNS + ["Status"])
+        for timestamp, hostname, sample, status in iter_history(directory, start_ts=start_ts, end_ts=end_ts):
+            writer.writerow(history_row(timestamp, hostname, sample) + [status])
+            rows += 1
+    return rows
+
+
+# ------------------------------------------------------------
+# Rollup Tiers | incremental min / max / mean / p95 per metric, one store and retention per tier
+#   Metric_Rollup_<tier>_<host>/<period>.fcol, row timestamp = bucket start; a bucket still open at shutdown
+#   is written with its partial sample count
+# ------------------------------------------------------------
+class RollupTier(NamedTuple):
+    name: str
+    bucket_sec: int
+    segment_format: str                 # Segment period: daily for fine tiers, monthly for coarse ones
+    retention_days: float
+
+
+ROLLUP_TIERS = (
+    RollupTier("1m", 60, "%Y-%m-%d", 30),
+    RollupTier("5m", 300, "%Y-%m", 180),
+    RollupTier("1h", 3600, "%Y-%m", 730),
+)
+RAW_RETENTION_DAYS = 7
+ROLLUP_STATS = ("min", "max", "mean", "p95")
+ROLLUP_COLUMNS = ("samples",) + tuple(f"{name}.{stat}" for name in HISTORY_STORE_COLUMNS for stat in ROLLUP_STATS)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]         # Nearest rank
+
+
+def rollup_row(samples, buckets):
+    row = [samples]
+    for values in buckets:
+        if values:
+            ordered = sorted(values)
+            row += [ordered[0], ordered[-1], sum(ordered) / len(ordered), percentile(ordered, 0.95)]
+        else:
+            row += [NAN] * len(ROLLUP_STATS)
+    return row
+
+
+class RollupAggregator:
+    def __init__(self, log_dir, hostname, tiers=ROLLUP_TIERS, on_new_segment=None, **store_kwargs):
+        self.hostname = hostname
+        self.tiers = tiers
+        self.stores = {}
+        for tier in tiers:
+            self.stores[tier.name] = SegmentStore(
+                rollup_directory(log_dir, tier.name, hostname), ROLLUP_COLUMNS, ["d"] * len(ROLLUP_COLUMNS),
+                segment_format=tier.segment_format,
+                on_new_segment=on_new_segment,
+                **store_kwargs,
+            )
+        self._bucket_start = {tier.name: None for tier in tiers}
+        self._samples = {tier.name: 0 for tier in tiers}
+        self._values = {tier.name: [array("d") for _ in HISTORY_STORE_COLUMNS] for tier in tiers}
+
+    def add(self, timestamp, sample):
+        for tier in self.tiers:
+            bucket_start = timestamp - timestamp % tier.bucket_sec
+            if self._bucket_start[tier.name] != bucket_start:
+                self._emit(tier)
+                self._bucket_start[tier.name] = bucket_start
+            self._samples[tier.name] += 1
+            if sample is None:
+                continue
+            for bucket, name in zip(self._values[tier.name], HISTORY_STORE_COLUMNS):
+                value = getattr(sample, name)
+                if value is not None:
+                    bucket.append(value)
+
+    def _emit(self, tier):
+        if self._samples[tier.name]:
+            self.stores[tier.name].append_row(
+                self._bucket_start[tier.name],
+                rollup_row(self._samples[tier.name], self._values[tier.name]),
+                {"hostname": self.hostname, "bucket_sec": tier.bucket_sec},
+            )
+        self._samples[tier.name] = 0
+        for bucket in self._values[tier.name]:
+            del bucket[:]
+
+    def set_flush_policy(self, block_rows, flush_seconds):
+        for store in self.stores.values():
+            store.set_flush_policy(block_rows, flush_seconds)
+
+    def close(self):
+        for tier in self.tiers:
+            self._emit(tier)
+            self.stores[tier.name].close()
+
+
+def rollup_directory(log_dir, tier_name, hostname):
+    return os.path.join(log_dir, f"Metric_Rollup_{tier_name}_{hostname}")
+
+
+def export_rollup_csv(directory, csv_path, tier, start_ts=None, end_ts=None):
+    rows = 0
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("Timestamp", "Hostname") + ROLLUP_COLUMNS)
+        for timestamp, meta, values in iter_store_rows(directory, ROLLUP_COLUMNS, None, start_ts, end_ts,
+                                                       tier.segment_format):
+            writer.writerow([format_timestamp(timestamp), meta.get("hostname", ""), int(values[0])]
+                            + ["" if value != value else value for value in values[1:]])
+            rows += 1
+    return rows
+
+
+# ------------------------------------------------------------
+# Collection Backends | where the core collectors get CPU / memory / disk / uptime numbers
+#   psutil : portable, a few namedtuples per tick
+#   proc   : Linux only, no psutil needed. /proc/stat, /proc/meminfo and /proc/uptime stay open; each tick is
+#            seek(0) + readinto() one reusable buffer per file and only the needed fields are parsed.
+#            Same definitions as psutil: busy % from cpu_times deltas, used memory = MemTotal - MemAvailable.
+#   auto   : proc where /proc is available, psutil elsewhere. Compare with --benchmark.
+# ------------------------------------------------------------
+BACKENDS = ("auto", "psutil", "proc")
+PROC_BUFFER_BYTES = 8192
+BENCHMARK_TICKS = 2000
+
+
+class PsutilBackend:
+    name = "psutil"
+
+    def __init__(self):
+        self.cpu_sampler = CpuSampler()
+
+    def cpu_percent(self):
+        return self.cpu_sampler.sample()
+
+    def memory(self):
+        mem = psutil.virtual_memory()
+        return mem.used, mem.total, mem.percent
+
+    def disk_usage(self, path):
+        disk = psutil.disk_usage(path)
+        return disk.used, disk.total, disk.percent
+
+    def uptime(self, now):
+        return now - psutil.boot_time()
+
+    def close(self):
+        pass
+
+
+# A /proc file kept open, re-read into one growing buffer; read() returns the valid length
+class ProcFile:
+    def __init__(self, path):
+        self._f = open(path, "rb", buffering=0)
+        self.buffer = bytearray(PROC_BUFFER_BYTES)
+
+    def read(self):
+        self._f.seek(0)
+        length = 0
+        while True:
+            with memoryview(self.buffer) as view:
+                count = self._f.readinto(view[length:])
+            if not count:
+                return length
+            length += count
+            if length == len(self.buffer):                                              # Grow, then keep reading
+                self.buffer.extend(bytes(len(self.buffer)))
+
+    def close(self):
+        self._f.close()
+
+
+# Integer value of a /proc/meminfo line ("MemTotal:       16316412 kB") -> bytes
+def meminfo_bytes(buffer, length, key):
+    start = buffer.find(key, 0, length)
+    if start < 0:
+        return None
+    end = buffer.find(b"\n", start, length)
+    return int(buffer[start + len(key):end].split()[0]) * 1024
+
+
+class ProcBackend:
+    name = "proc"
+
+    def __init__(self):
+        self._stat = ProcFile("/proc/stat")
+        self._meminfo = ProcFile("/proc/meminfo")
+        self._uptime = ProcFile("/proc/uptime")
+        self._previous = self.cpu_total_and_idle()                                     # Baseline for the first tick
+
+    # Aggregate "cpu" line: user nice system idle iowait irq softirq steal guest guest_nice (as cpu_total_and_idle)
+    def cpu_total_and_idle(self):
+        length = self._stat.read()
+        fields = [int(value) for value in self._stat.buffer[:self._stat.buffer.find(b"\n", 0, length)].split()[1:]]
+        total = sum(fields[:8])                                                         # guest is already in user/nice
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        return total, idle
+
+    def cpu_percent(self):
+        current_total, current_idle = current = self.cpu_total_and_idle()
+        previous_total, previous_idle = self._previous
+        self._previous = current
+        total_delta = current_total - previous_total
+        if total_delta <= 0:
+            return 0.0
+        busy = 100.0 * (1.0 - (current_idle - previous_idle) / total_delta)
+        return min(max(busy, 0.0), 100.0)
+
+    def memory(self):
+        length = self._meminfo.read()
+        total = meminfo_bytes(self._meminfo.buffer, length, b"MemTotal:")
+        available = meminfo_bytes(self._meminfo.buffer, length, b"MemAvailable:")
+        if available is None:                                                           # Kernel < 3.14
+            available = sum(meminfo_bytes(self._meminfo.buffer, length, key) or 0
+                            for key in (b"MemFree:", b"Buffers:", b"Cached:"))
+        available = min(max(available, 0), total)
+        return total - available, total, round(100.0 * (total - available) / total, 1) if total else 0.0
+
+    def disk_usage(self, path):
+        return mount_usage(path)[:3]
+
+    def uptime(self, now):
+        length = self._uptime.read()
+        return float(self._uptime.buffer[:length].split()[0])
+
+    def close(self):
+        for f in (self._stat, self._meminfo, self._uptime):
+            f.close()
+
+
+def proc_backend_available():
+    return all(os.path.exists(path) for path in ("/proc/stat", "/proc/meminfo", "/proc/uptime"))
+
+
+def create_backend(name):
+    if name == "auto":
+        name = "proc" if proc_backend_available() else "psutil"
+    if name == "proc":
+        if not proc_backend_available():
+            raise ValueError("the proc backend needs Linux /proc")
+        return ProcBackend()
+    if psutil is None:
+        raise ValueError("the psutil backend needs psutil (pip install psutil)")
+    return PsutilBackend()
+
+
+# Per-tick cost of the core collectors for every usable backend (--benchmark)
+def run_benchmark(ticks, disk_path):
+    print(f"Benchmark: {ticks} ticks of the {', '.join(METRIC_GROUPS)} collectors (disk path {disk_path})")
+    print("Backend | us per tick | Total (s)")
+    for name in BACKENDS[1:]:
+        try:
+            backend = create_backend(name)
+        except ValueError as error_found:
+            print(f"{name} | N/A ({error_found})")
+            continue
+        collectors = [COLLECTORS[group](backend=backend, disk_path=disk_path) for group in METRIC_GROUPS]
+        for collector in collectors:                                                    # Warm up
+            collector.collect()
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for collector in collectors:
+                collector.collect()
+        elapsed = time.perf_counter() - start
+        backend.close()
+        print(f"{name} | {1e6 * elapsed / ticks:.1f} | {elapsed:.3f}")
+
+
+# ------------------------------------------------------------
+# Collector Registry | one class per metric source, registered with @register_collector
+#   name       : --metrics key              title  : store directory / console prefix
+#   schema     : column names; None when they depend on the host (mounts, devices, interfaces)
+#   period_sec : default cadence (None = every tick); overridden with --periods name=duration,...
+#   core       : fields of the Metric_History row (MetricSample); others keep <Title>_History_<host>/
+#   collect()  : {column: value or None}     summary(metrics) : console line     close() : release handles
+#   report()   : end-of-run text for the run report ("" = none)
+#   Constructed with keyword context (backend, stat_pool, disk_path, sensor_root, sensor_pattern); take what you need.
+# ------------------------------------------------------------
+COLLECTORS = {}
+
+
+def register_collector(cls):
+    COLLECTORS[cls.name] = cls
+    return cls
+
+
+class Collector:
+    name = ""
+    title = ""
+    schema = None
+    period_sec = None
+    core = False
+    requires_psutil = False
+
+    def __init__(self, **context):
+        pass
+
+    def collect(self):
+        return {}
+
+    def summary(self, metrics):
+        return f"{self.title}: " + " | ".join(f"{name} {value}" for name, value in metrics.items())
+
+    def report(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# Metrics Collection | m_<metric-name> - the core collectors behind the Metric_History row
+#   Uptime and disk capacity move slowly, so they are re-read less often and carried forward in between
+# ------------------------------------------------------------
+METRIC_GROUPS = ("cpu", "memory", "disk", "uptime")
+RATE_MIN_WINDOW_SECONDS = 0.1          # Shortest window a CPU % / rate is computed over (start-up ticks)
+
+
+@register_collector
+class CpuCollector(Collector):
+    name = "cpu"
+    title = "CPU"
+    schema = ("cpu_percent",)
+    core = True
+
+    def __init__(self, backend, **context):
+        self.backend = backend
+        self._started = time.monotonic()
+
+    # The first reading comes right after start-up, itself busy starting the other collectors: when that
+    # window is shorter than RATE_MIN_WINDOW_SECONDS it only sets the baseline (status "unavailable")
+    def collect(self):
+        busy = self.backend.cpu_percent()                                               # Collection - CPU Usage
+        if self._started is not None:
+            started, self._started = self._started, None
+            if time.monotonic() - started < RATE_MIN_WINDOW_SECONDS:
+                busy = None
+        return {"cpu_percent": busy}
+
+
+@register_collector
+class MemoryCollector(Collector):
+    name = "memory"
+    title = "Memory"
+    schema = ("used_memory_bytes", "total_memory_bytes", "memory_percent")
+    core = True
+
+    def __init__(self, backend, **context):
+        self.backend = backend
+
+    def collect(self):
+        return dict(zip(self.schema, self.backend.memory()))                           # Collection - Memory Usage
+
+
+@register_collector
+class DiskCollector(Collector):
+    name = "disk"
+    title = "Disk"
+    schema = ("used_disk_bytes", "total_disk_bytes", "disk_percent")
+    period_sec = 60.0
+    core = True
+
+    def __init__(self, backend, disk_path, stat_pool=None, **context):
+        self.backend = backend
+        self.disk_path = disk_path
+        self.stat_pool = stat_pool
+
+    def collect(self):                                                                  # Collection - Disk Usage
+        if self.stat_pool is None:
+            return dict(zip(self.schema, self.backend.disk_usage(self.disk_path)))
+        usage = self.stat_pool.call(self.backend.disk_usage, self.disk_path)
+        return dict(zip(self.schema, usage or (None,) * len(self.schema)))                # Stale: N/A, not old values
+
+
+@register_collector
+class UptimeCollector(Collector):
+    name = "uptime"
+    title = "Uptime"
+    schema = ("uptime_seconds",)
+    period_sec = 300.0
+    core = True
+
+    def __init__(self, backend, **context):
+        self.backend = backend
+
+    def collect(self):
+        return {"uptime_seconds": self.backend.uptime(time.time())}                    # Collection - Uptime
+
+
+# ------------------------------------------------------------
+# Metric Set Store | per-collector history whose column set may change (mounts, devices, interfaces)
+#   a different column set starts a new segment part
+# ------------------------------------------------------------
+class MetricSetStore(SegmentStore):
+    def __init__(self, directory, hostname, **kwargs):
+        super().__init__(directory, (), (), **kwargs)
+        self.hostname = hostname
+
+    def append(self, timestamp, metrics):
+        columns = tuple(metrics)
+        if columns != self.columns:
+            self.close()
+            self.columns, self.types, self._period = columns, ("d",) * len(columns), None
+        self.append_row(timestamp, [NAN if value is None else value for value in metrics.values()],
+                        {"hostname": self.hostname})
+
+
+# ------------------------------------------------------------
+# Worker Pool | bounded daemon-thread executor for calls that may block (daemon threads, so a call stuck in
+#   the kernel never blocks interpreter exit). Stat pool use: statvfs / disk_usage under a per-tick deadline,
+#   so a hung (e.g. NFS) mount cannot stall sampling. A call that misses the deadline marks its key stale;
+#   the key is skipped until that call finally returns.
+# ------------------------------------------------------------
+STAT_WORKERS = 4
+STAT_TIMEOUT_SECONDS = 2.0
+
+
+class WorkerPool:
+    def __init__(self, workers=STAT_WORKERS, timeout_sec=STAT_TIMEOUT_SECONDS, name="fa-stat"):
+        self.timeout_sec = timeout_sec
+        self.stale = {}                                                                 # key -> outstanding future
+        self._jobs = queue.Queue()
+        for number in range(workers):
+            threading.Thread(target=self._worker, name=f"{name}-{number}", daemon=True).start()
+
+    def _worker(self):
+        while True:
+            future, function, args = self._jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except BaseException as error_found:
+                future.set_exception(error_found)
+
+    def submit(self, function, *args):
+        future = Future()
+        self._jobs.put((future, function, args))
+        return future
+
+    # {key: result or exception} for keys that answered in time; stale / skipped keys are left out
+    def map(self, function, keys):
+        for key, future in list(self.stale.items()):
+            if future.done():                                                           # Recovered
+                del self.stale[key]
+        futures = {}
+        for key in keys:
+            if key not in self.stale:
+                futures[key] = self.submit(function, key)
+        wait(futures.values(), timeout=self.timeout_sec)
+        results = {}
+        for key, future in futures.items():
+            if future.done():
+                error_found = future.exception()
+                results[key] = error_found if error_found is not None else future.result()
+            elif not future.cancel():                                                   # Started and hung
+                self.stale[key] = future
+        return results
+
+    # Single call: result, None when stale / timed out, re-raises the call's own error
+    def call(self, function, key):
+        result = self.map(function, [key]).get(key)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+# ------------------------------------------------------------
+# Mount Collector | usage + inode usage of every real mounted filesystem
+#   Linux: /proc/self/mountinfo parsed once, deduplicated by device ID, re-read only when poll() reports a
+#   mount table change. Elsewhere: psutil.disk_partitions(), refreshed every MOUNT_REFRESH_SECONDS.
 # ------------------------------------------------------------
-# Metrics Collection | m_<metric-name>
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+MOUNT_REFRESH_SECONDS = 300
+PSEUDO_FILESYSTEMS = {
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts", "devtmpfs", "efivarfs",
+    "fusectl", "hugetlbfs", "mqueue", "nsfs", "proc", "pstore", "ramfs", "rpc_pipefs", "securityfs", "selinuxfs",
+    "squashfs", "sysfs", "tmpfs", "tracefs", "fuse.gvfsd-fuse", "fuse.portal", "overlay",
+}
+
+
+def unescape_mount_path(path):
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), path)
+
+
+# [(mount point, fs type, device id)] of real filesystems, first (shortest) mount point per device
+def parse_mountinfo(text):
+    mounts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields:
+            continue
+        separator = fields.index("-")
+        device_id, mount_point, fs_type = fields[2], unescape_mount_path(fields[4]), fields[separator + 1]
+        if fs_type in PSEUDO_FILESYSTEMS:
+            continue
+        if device_id not in mounts or len(mount_point) < len(mounts[device_id][0]):
+            mounts[device_id] = (mount_point, fs_type, device_id)
+    return sorted(mounts.values())
+
+
+def mount_usage(mount_point):
+    if not hasattr(os, "statvfs"):                                                      # Windows
+        usage = psutil.disk_usage(mount_point)
+        return usage.used, usage.total, usage.percent, None, None, None
+    st = os.statvfs(mount_point)
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    available = st.f_bavail * st.f_frsize
+    percent = round(100.0 * used / (used + available), 1) if used + available else 0.0     # As psutil / df
+    inodes_used = st.f_files - st.f_ffree
+    inodes_percent = round(100.0 * inodes_used / st.f_files, 1) if st.f_files else None
+    return used, total, percent, inodes_used, st.f_files or None, inodes_percent
+
+
+@register_collector
+class MountCollector(Collector):
+    name = "mounts"
+    title = "Mounts"
+
+    def __init__(self, stat_pool=None, **context):
+        self.stat_pool = stat_pool or WorkerPool()
+        self.mounts = []
+        self._mountinfo = None
+        self._poller = None
+        self._next_refresh = 0.0
+        if os.path.exists(MOUNTINFO_PATH):
+            self._mountinfo = open(MOUNTINFO_PATH)
+            self._poller = select.poll()
+            self._poller.register(self._mountinfo, select.POLLPRI | select.POLLERR)
+        self.refresh()
+
+    def refresh(self):
+        if self._mountinfo is not None:
+            self._mountinfo.seek(0)
+            self.mounts = [mount_point for mount_point, _, _ in parse_mountinfo(self._mountinfo.read())]
+        else:
+            seen = set()
+            self.mounts = []
+            for partition in psutil.disk_partitions(all=False):
+                if partition.fstype in PSEUDO_FILESYSTEMS or partition.device in seen:
+                    continue
+                seen.add(partition.device)
+                self.mounts.append(partition.mountpoint)
+        self._next_refresh = time.monotonic() + MOUNT_REFRESH_SECONDS
+
+    def mounts_changed(self):
+        if self._poller is not None:
+            return bool(self._poller.poll(0))
+        return time.monotonic() >= self._next_refresh
+
+    def collect(self):
+        if self.mounts_changed():
+            self.refresh()
+        results = self.stat_pool.map(mount_usage, self.mounts)
+        metrics = {}
+        for mount_point in self.mounts:
+            usage = results.get(mount_point)
+            if isinstance(usage, OSError):
+                continue                                                                # Unmounted since refresh
+            if usage is None:                                                           # Stale: keep the columns
+                usage = (None,) * 6
+            used, total, percent, inodes_used, inodes_total, inodes_percent = usage
+            metrics[f"{mount_point}.used_bytes"] = used
+            metrics[f"{mount_point}.total_bytes"] = total
+            metrics[f"{mount_point}.percent"] = percent
+            metrics[f"{mount_point}.inodes_used"] = inodes_used
+            metrics[f"{mount_point}.inodes_total"] = inodes_total
+            metrics[f"{mount_point}.inodes_percent"] = inodes_percent
+        return metrics
+
+    def summary(self, metrics):
+        line = "Mounts: " + " | ".join(
+            f"{name[:-len('.percent')]} {'N/A' if value is None else f'{value}%'}" for name, value in metrics.items()
+            if name.endswith(".percent") and not name.endswith(".inodes_percent")
+        )
+        stale = [key for key in self.stat_pool.stale if key in self.mounts]
+        return line + (f" | STALE: {', '.join(stale)}" if stale else "")
+
+    def close(self):
+        if self._mountinfo is not None:
+            self._mountinfo.close()
+
+
+# ------------------------------------------------------------
+# Disk I/O Collector | per-device throughput, IOPS, queue depth and await from counter deltas between ticks
+#   Linux: /proc/diskstats (whole devices only, loop / ram skipped). Elsewhere: psutil.disk_io_counters(perdisk=True).
+#   A device appearing (hotplug) gets its baseline on the first tick it is seen; a vanished device is dropped.
+# ------------------------------------------------------------
+DISKSTATS_PATH = "/proc/diskstats"
+DISKSTATS_SECTOR_BYTES = 512                                                            # Fixed by the kernel ABI
+DISKIO_SKIP_PREFIXES = ("loop", "ram", "zram")
+DISKIO_FIELDS = ("read_bytes_per_sec", "write_bytes_per_sec", "read_iops", "write_iops", "queue_depth", "await_ms")
+
+
+class DiskCounters(NamedTuple):                                                         # Cumulative; None = not exposed
+    reads: int
+    writes: int
+    read_bytes: int
+    write_bytes: int
+    read_ms: int
+    write_ms: int
+    weighted_ms: Optional[int]                                                          # Time-in-queue integral
+
+
+# Counters are unsigned long in the kernel (32 bit on 32-bit hosts, some fields 32 bit everywhere):
+# a decrease is a wrap at the smallest width that explains it, or a device reset (None) if implausibly large
+def counter_delta(previous, current):
+    if current >= previous:
+        return current - previous
+    for width in (2 ** 32, 2 ** 64):
+        if previous < width:
+            delta = current + width - previous
+            return delta if delta < width // 2 else None
+    return None
+
+
+def read_diskstats(f):
+    f.seek(0)
+    counters = {}
+    for line in f.read().splitlines():
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        name = fields[2]
+        if name.startswith(DISKIO_SKIP_PREFIXES) or not os.path.exists(f"/sys/block/{name.replace('/', '!')}"):
+            continue                                                                    # Partitions are not in /sys/block
+        values = [int(value) for value in fields[3:14]]
+        counters[name] = DiskCounters(
+            reads=values[0], writes=values[4],
+            read_bytes=values[2] * DISKSTATS_SECTOR_BYTES, write_bytes=values[6] * DISKSTATS_SECTOR_BYTES,
+            read_ms=values[3], write_ms=values[7], weighted_ms=values[10],
+        )
+    return counters
+
+
+def psutil_disk_counters():
+    counters = {}
+    for name, io in (psutil.disk_io_counters(perdisk=True) or {}).items():
+        if name.startswith(DISKIO_SKIP_PREFIXES):
+            continue
+        counters[name] = DiskCounters(
+            reads=io.read_count, writes=io.write_count, read_bytes=io.read_bytes, write_bytes=io.write_bytes,
+            read_ms=getattr(io, "read_time", 0), write_ms=getattr(io, "write_time", 0), weighted_ms=None,
+        )
+    return counters
+
+
+def disk_io_rates(previous, current, elapsed):
+    deltas = [counter_delta(before, after) for before, after in zip(previous[:6], current[:6])]
+    if None in deltas or elapsed <= 0:                                                  # Reset: no rates this tick
+        return (None,) * len(DISKIO_FIELDS)
+    reads, writes, read_bytes, write_bytes, read_ms, write_ms = deltas
+    queue_ms = None
+    if previous.weighted_ms is not None and current.weighted_ms is not None:
+        queue_ms = counter_delta(previous.weighted_ms, current.weighted_ms)
+    return (
+        read_bytes / elapsed,
+        write_bytes / elapsed,
+        reads / elapsed,
+        writes / elapsed,
+        None if queue_ms is None else queue_ms / (elapsed * 1000.0),                     # Average queue size (aqu-sz)
+        (read_ms + write_ms) / (reads + writes) if reads + writes else 0.0,
+    )
+
+
+@register_collector
+class DiskIOCollector(Collector):
+    name = "diskio"
+    title = "DiskIO"
+
+    def __init__(self, **context):
+        self._diskstats = open(DISKSTATS_PATH) if os.path.exists(DISKSTATS_PATH) else None
+        self._previous = self.read_counters()
+        self._previous_time = time.monotonic()
+
+    def read_counters(self):
+        return read_diskstats(self._diskstats) if self._diskstats is not None else psutil_disk_counters()
+
+    def collect(self):
+        current, now = self.read_counters(), time.monotonic()
+        elapsed = now - self._previous_time
+        if elapsed < RATE_MIN_WINDOW_SECONDS:                                           # Start-up tick: baseline kept
+            return {f"{device}.{field}": None for device in self._previous for field in DISKIO_FIELDS}
+        metrics = {}
+        for device, counters in current.items():
+            if device not in self._previous:                                            # Hotplugged: baseline only
+                continue
+            for field, value in zip(DISKIO_FIELDS, disk_io_rates(self._previous[device], counters, elapsed)):
+                metrics[f"{device}.{field}"] = value
+        self._previous, self._previous_time = current, now
+        return metrics
+
+    def summary(self, metrics):
+        devices = dict.fromkeys(name.rsplit(".", 1)[0] for name in metrics)
+        parts = []
+        for device in devices:
+            read_rate, write_rate, read_iops, write_iops, queue_depth, await_ms = (
+                metrics[f"{device}.{field}"] for field in DISKIO_FIELDS
+            )
+            if read_rate is None:
+                parts.append(f"{device} N/A")
+                continue
+            part = (f"{device} r {read_rate / MIB:.2f} MB/s w {write_rate / MIB:.2f} MB/s "
+                    f"{read_iops + write_iops:.0f} IOPS await {await_ms:.1f} ms")
+            parts.append(part if queue_depth is None else part + f" q {queue_depth:.2f}")
+        return "Disk I/O: " + " | ".join(parts)
+
+    def close(self):
+        if self._diskstats is not None:
+            self._diskstats.close()
+
+
+# ------------------------------------------------------------
+# Network Collector | per-interface rx/tx bytes/s, packets/s, drops/s and errors/s from net_io_counters deltas
+#   Previous counters live in one flat array ("Q", NETWORK_COUNTERS slots per interface) indexed through a
+#   name -> slot map that is rebuilt only when the interface set changes. Counters are read from psutil's snetio
+#   by field name (its positional order differs from NETWORK_COUNTERS). Loopback is skipped.
+# ------------------------------------------------------------
+NETWORK_COUNTERS = ("bytes_recv", "bytes_sent", "packets_recv", "packets_sent", "dropin", "dropout", "errin", "errout")
+NETWORK_FIELDS = ("rx_bytes_per_sec", "tx_bytes_per_sec", "rx_packets_per_sec", "tx_packets_per_sec",
+                  "rx_drops_per_sec", "tx_drops_per_sec", "rx_errors_per_sec", "tx_errors_per_sec")
+NETWORK_SKIP_INTERFACES = ("lo", "lo0")
+NETWORK_SUMMARY_INTERFACES = 5          # Busiest interfaces shown on the console line
+
+
+@register_collector
+class NetworkCollector(Collector):
+    name = "network"
+    title = "Network"
+    requires_psutil = True
+
+    def __init__(self, **context):
+        self._slots = {}                                                                # interface -> slot
+        self._previous = array("Q")
+        self._previous_time = time.monotonic()
+        self.snapshot(psutil.net_io_counters(pernic=True))
+
+    # Stores the counters; rebuilds the slot map (keeping known interfaces' values) when interfaces came or went
+    def snapshot(self, counters):
+        width = len(NETWORK_COUNTERS)
+        names = [name for name in counters if name not in NETWORK_SKIP_INTERFACES]
+        if len(names) != len(self._slots) or any(name not in self._slots for name in names):
+            previous, slots = self._previous, self._slots
+            self._previous = array("Q", bytes(8 * width * len(names)))
+            self._slots = {name: slot for slot, name in enumerate(names)}
+            for name, slot in self._slots.items():
+                if name in slots:
+                    old = slots[name] * width
+                    self._previous[slot * width:(slot + 1) * width] = previous[old:old + width]
+        for name in names:
+            base = self._slots[name] * width
+            for offset, counter in enumerate(NETWORK_COUNTERS):
+                self._previous[base + offset] = getattr(counters[name], counter)
+
+    def collect(self):
+        counters, now = psutil.net_io_counters(pernic=True), time.monotonic()
+        elapsed = now - self._previous_time
+        if elapsed < RATE_MIN_WINDOW_SECONDS:                                           # Start-up tick: baseline kept
+            return {f"{name}.{field}": None for name in self._slots for field in NETWORK_FIELDS}
+        width = len(NETWORK_COUNTERS)
+        metrics = {}
+        for name, slot in self._slots.items():
+            if name not in counters:                                                    # Gone since last tick
+                continue
+            base = slot * width
+            for offset, (field, counter) in enumerate(zip(NETWORK_FIELDS, NETWORK_COUNTERS)):
+                delta = counter_delta(self._previous[base + offset], getattr(counters[name], counter))
+                metrics[f"{name}.{field}"] = None if delta is None else delta / elapsed
+        self.snapshot(counters)                                                         # New interfaces: baseline only
+        self._previous_time = now
+        return metrics
+
+    def summary(self, metrics):
+        interfaces = dict.fromkeys(name.rsplit(".", 1)[0] for name in metrics)
+        rates = {
+            interface: [metrics[f"{interface}.{field}"] for field in NETWORK_FIELDS] for interface in interfaces
+        }
+        busiest = sorted(rates, key=lambda interface: sum(value or 0.0 for value in rates[interface][:2]),
+                         reverse=True)[:NETWORK_SUMMARY_INTERFACES]
+        parts = []
+        for interface in busiest:
+            rx, tx, rx_packets, tx_packets, *faults = rates[interface]
+            if rx is None or tx is None:
+                parts.append(f"{interface} N/A")
+                continue
+            part = f"{interface} rx {rx / MIB:.2f} MB/s tx {tx / MIB:.2f} MB/s {rx_packets + tx_packets:.0f} pkt/s"
+            drops, errors = sum(faults[:2]), sum(faults[2:])
+            if drops or errors:
+                part += f" drops {drops:.1f}/s errors {errors:.1f}/s"
+            parts.append(part)
+        if len(interfaces) > len(busiest):
+            parts.append(f"+{len(interfaces) - len(busiest)} more")
+        return "Network: " + " | ".join(parts)
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# Process Collector | top-N processes by CPU with RSS and I/O rate
+#   The per-tick walk is one process_iter(attrs=("pid", "create_time", "cpu_times")) - on Linux a single
+#   /proc/<pid>/stat read per process; name, RSS and I/O are then read inside oneshot() for the top N only.
+#   Live processes are kept as {(pid, create_time): [Process, cpu seconds, I/O bytes]}, so CPU % and I/O rates
+#   are deltas since the previous tick (no blocking cpu_percent(interval)) and a reused PID never inherits
+#   another process's counters. I/O rate needs two consecutive ticks in the top N.
+#   Columns are per rank (top1.pid, top1.cpu_percent, ...) so the stored column set stays fixed.
+# ------------------------------------------------------------
+TOP_PROCESS_COUNT = 5
+TOP_PROCESS_ATTRS = ("pid", "create_time", "cpu_times")
+TOP_PROCESS_FIELDS = ("pid", "cpu_percent", "rss_bytes", "io_bytes_per_sec")
+
+
+@register_collector
+class ProcessCollector(Collector):
+    name = "processes"
+    title = "Processes"
+    requires_psutil = True
+
+    def __init__(self, **context):
+        self._processes = {}                                                            # (pid, create_time) -> state
+        self._previous_time = time.monotonic()
+        self.top = []                                                                   # [(name, pid, cpu, rss, io)]
+        self.collect()
+
+    def collect(self):
+        now = time.monotonic()
+        elapsed = now - self._previous_time
+        if self._processes and elapsed < RATE_MIN_WINDOW_SECONDS:                       # First tick right after
+            self.top = []                                                               # the baseline walk
+            return self.rank_metrics()
+        live = {}
+        ranked = []
+        for process in psutil.process_iter(attrs=TOP_PROCESS_ATTRS, ad_value=None):
+            info = process.info
+            if info["cpu_times"] is None:
+                continue
+            key = (info["pid"], info["create_time"])
+            cpu_seconds = info["cpu_times"].user + info["cpu_times"].system
+            state = self._processes.get(key)
+            live[key] = [process, cpu_seconds, state[2] if state is not None else None]
+            if state is not None and elapsed > 0:                                       # New process: baseline only
+                ranked.append((100.0 * max(cpu_seconds - state[1], 0.0) / elapsed, key))
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        self.top = []
+        for cpu_percent, key in ranked[:TOP_PROCESS_COUNT]:
+            process, _, previous_io = state = live[key]
+            try:
+                with process.oneshot():
+                    name, rss = process.name(), process.memory_info().rss
+                    try:
+                        io = process.io_counters()
+                        state[2] = io.read_bytes + io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):                       # Not permitted / not exposed
+                        state[2] = None
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            io_rate = None if state[2] is None or previous_io is None else max(state[2] - previous_io, 0) / elapsed
+            self.top.append((name, key[0], cpu_percent, rss, io_rate))
+        self._processes, self._previous_time = live, now                                # Exited processes drop out
+        return self.rank_metrics()
+
+    def rank_metrics(self):
+        metrics = {}
+        for rank in range(TOP_PROCESS_COUNT):
+            name, pid, cpu, rss, io = self.top[rank] if rank < len(self.top) else (None,) * 5
+            for field, value in zip(TOP_PROCESS_FIELDS, (pid, cpu, rss, io)):
+                metrics[f"top{rank + 1}.{field}"] = value
+        return metrics
+
+    def summary(self, metrics):
+        if not self.top:
+            return "Top processes: N/A"
+        return "Top processes: " + " | ".join(
+            f"{name}[{pid}] {cpu:.1f}% {rss / MIB:.0f} MB" + (f" io {io / MIB:.2f} MB/s" if io is not None else "")
+            for name, pid, cpu, rss, io in self.top
+        )
+
+    def close(self):
+        self._processes.clear()
+
+
+# ------------------------------------------------------------
+# FA Sensor Collector | CPU, RSS, threads, open FDs and I/O of the FA sensor's own processes (summed)
+#   Processes are resolved once - executable under the FA install path (get_disk_path / --disk-path) or name
+#   matching --sensor-pattern - and cached as {(pid, create_time): [Process, cpu s, read bytes, write bytes]}.
+#   Each tick compares psutil.pids() with the previous set: only new PIDs are inspected and exited ones dropped,
+#   so the per-tick cost follows the sensor's process count, not the host's.
+# ------------------------------------------------------------
+SENSOR_FIELDS = ("process_count", "cpu_percent", "rss_bytes", "threads", "open_fds",
+                 "read_bytes_per_sec", "write_bytes_per_sec")
+
+
+@register_collector
+class SensorCollector(Collector):
+    name = "sensor"
+    title = "Sensor"
+    requires_psutil = True
+
+    def __init__(self, sensor_root=None, sensor_pattern=None, **context):
+        self.root = os.path.join(os.path.realpath(sensor_root), "") if sensor_root else None
+        self.pattern = re.compile(sensor_pattern) if sensor_pattern else None
+        self._tracked = {}                                                              # (pid, create_time) -> state
+        self._pids = set()
+        self._previous_time = time.monotonic()
+        self.discover()
+
+    def matches(self, process):
+        try:
+            with process.oneshot():
+                if self.pattern is not None and self.pattern.search(process.name()):
+                    return True
+                return self.root is not None and (process.exe() or "").startswith(self.root)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def track(self, process):
+        try:
+            with process.oneshot():
+                key = (process.pid, process.create_time())
+                self._tracked[key] = [process, None, None, None]                        # Baseline on first collect
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+    # Tracks sensor processes among PIDs not seen before; forgets tracked processes that exited
+    def discover(self):
+        pids = set(psutil.pids())
+        for pid in pids - self._pids:
+            try:
+                process = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                continue
+            if self.matches(process):
+                self.track(process)
+        gone = self._pids - pids
+        if gone:
+            self._tracked = {key: state for key, state in self._tracked.items() if key[0] not in gone}
+        self._pids = pids
+
+    def collect(self):
+        self.discover()
+        now = time.monotonic()
+        elapsed = now - self._previous_time
+        cpu_percent = read_rate = write_rate = 0.0
+        rss = threads = fds = 0
+        for key, state in list(self._tracked.items()):
+            process = state[0]
+            try:
+                with process.oneshot():
+                    if not process.is_running():                                        # PID reused between ticks
+                        raise psutil.NoSuchProcess(key[0])
+                    times = process.cpu_times()
+                    process_rss = process.memory_info().rss
+                    process_threads = process.num_threads()
+                    try:                                                                # Often denied unless root
+                        process_fds = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+                    except psutil.AccessDenied:
+                        process_fds = 0
+                    try:
+                        io = process.io_counters()
+                        io_bytes = (io.read_bytes, io.write_bytes)
+                    except (psutil.AccessDenied, AttributeError):
+                        io_bytes = (None, None)
+            except psutil.NoSuchProcess:
+                del self._tracked[key]
+                continue
+            except psutil.AccessDenied:
+                continue
+            rss += process_rss                                                          # Totals only once every
+            threads += process_threads                                                  # required read succeeded
+            fds += process_fds
+            cpu_seconds = times.user + times.system
+            if state[1] is not None and elapsed > 0:
+                cpu_percent += 100.0 * max(cpu_seconds - state[1], 0.0) / elapsed
+                if io_bytes[0] is not None and state[2] is not None:
+                    read_rate += max(io_bytes[0] - state[2], 0) / elapsed
+                    write_rate += max(io_bytes[1] - state[3], 0) / elapsed
+            state[1:] = [cpu_seconds, *io_bytes]
+        self._previous_time = now
+        values = (len(self._tracked), cpu_percent, rss, threads, fds, read_rate, write_rate)
+        return dict(zip(SENSOR_FIELDS, values))
+
+    def summary(self, metrics):
+        if not metrics["process_count"]:
+            return "Sensor: no FA processes found"
+        return (f"Sensor: {metrics['process_count']} processes | CPU {metrics['cpu_percent']:.1f}% | "
+                f"RSS {metrics['rss_bytes'] / MIB:.0f} MB | threads {metrics['threads']} | FDs {metrics['open_fds']} | "
+                f"io r {metrics['read_bytes_per_sec'] / MIB:.2f} w {metrics['write_bytes_per_sec'] / MIB:.2f} MB/s")
+
+    def close(self):
+        self._tracked.clear()
+
+
+# ------------------------------------------------------------
+# Pressure Collector | PSI stall averages / totals, load average and running / blocked task counts
+#   Linux: /proc/pressure/{cpu,memory,io}, /proc/loadavg and /proc/stat kept open and read once per tick each
+#   (seek(0) + read). Resources without a PSI file (kernel < 4.20 or PSI disabled) are left out for the run.
+#   Elsewhere: os.getloadavg() only.
+# ------------------------------------------------------------
+PRESSURE_DIRECTORY = "/proc/pressure"
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+PRESSURE_KINDS = ("some", "full")
+PRESSURE_FIELDS = ("avg10", "avg60", "total")                                           # total = stall µs since boot
+LOADAVG_PATH = "/proc/loadavg"
+PROC_STAT_PATH = "/proc/stat"
+
+
+def parse_pressure(text):
+    values = {}
+    for line in text.splitlines():
+        kind, *pairs = line.split()
+        for pair in pairs:
+            field, _, value = pair.partition("=")
+            if field in PRESSURE_FIELDS:
+                values[f"{kind}.{field}"] = float(value)
+    return values
+
+
+def parse_proc_stat_tasks(text):
+    running = blocked = None
+    for line in text.splitlines():
+        if line.startswith("procs_running "):
+            running = int(line.split()[1])
+        elif line.startswith("procs_blocked "):
+            blocked = int(line.split()[1])
+    return running, blocked
+
+
+def read_from_start(f):
+    f.seek(0)
+    return f.read()
+
+
+@register_collector
+class PressureCollector(Collector):
+    name = "pressure"
+    title = "Pressure"
+
+    def __init__(self, **context):
+        self._pressure = {}
+        for resource in PRESSURE_RESOURCES:
+            try:
+                self._pressure[resource] = open(os.path.join(PRESSURE_DIRECTORY, resource))
+            except OSError:
+                pass
+        self._loadavg = open(LOADAVG_PATH) if os.path.exists(LOADAVG_PATH) else None
+        self._stat = open(PROC_STAT_PATH) if os.path.exists(PROC_STAT_PATH) else None
+
+    def collect(self):
+        metrics = {}
+        for resource, f in self._pressure.items():
+            values = parse_pressure(read_from_start(f))
+            for kind in PRESSURE_KINDS:
+                for field in PRESSURE_FIELDS:
+                    metrics[f"{resource}.{kind}.{field}"] = values.get(f"{kind}.{field}")
+        if self._loadavg is not None:
+            load = [float(value) for value in read_from_start(self._loadavg).split()[:3]]
+        else:
+            load = list(os.getloadavg()) if hasattr(os, "getloadavg") else [None] * 3
+        metrics.update(zip(("load1", "load5", "load15"), load))
+        if self._stat is not None:
+            metrics["procs_running"], metrics["procs_blocked"] = parse_proc_stat_tasks(read_from_start(self._stat))
+        return metrics
+
+    def summary(self, metrics):
+        parts = []
+        if metrics["load1"] is not None:
+            parts.append(f"load {metrics['load1']} {metrics['load5']} {metrics['load15']}")
+        if "procs_running" in metrics:
+            parts.append(f"running {metrics['procs_running']} blocked {metrics['procs_blocked']}")
+        parts.extend(
+            f"{resource} some {metrics[f'{resource}.some.avg10']:.2f}%"
+            + (f" full {metrics[f'{resource}.full.avg10']:.2f}%" if metrics[f"{resource}.full.avg10"] is not None else "")
+            for resource in self._pressure
+        )
+        return "Pressure: " + " | ".join(parts)
+
+    def close(self):
+        for f in [*self._pressure.values(), self._loadavg, self._stat]:
+            if f is not None:
+                f.close()
+
+
+# ------------------------------------------------------------
+# Per-CPU Collector | per-core busy % and per-mode share of each core's time since the previous tick
+#   Stored per core (cpu0.busy, cpu0.user, ...) in PerCPU_History_<host>/; the hot-core table comes from running
+#   aggregates and is printed with the run report. Selected with --metrics percpu or --percpu.
+# ------------------------------------------------------------
+PERCPU_MODES = ("user", "system", "iowait", "steal", "irq")
+HOT_CORE_THRESHOLD = 90.0               # Busy % at which a core counts as pegged
+HOT_CORE_REPORT_COUNT = 5
+PERCPU_SUMMARY_CORES = 3                # Busiest cores shown on the console line
+
+
+# Running per-core aggregates so the report needs no pass over the stored history
+class HotCoreSummary:
+    def __init__(self, core_count):
+        self.samples = 0
+        self.busy_sum = array("d", [0.0] * core_count)
+        self.busy_max = array("d", [0.0] * core_count)
+        self.hot_ticks = array("L", [0] * core_count)
+
+    def update(self, row):
+        self.samples += 1
+        stride = 1 + len(PERCPU_MODES)
+        for core in range(len(self.busy_sum)):
+            busy = row[core * stride]
+            self.busy_sum[core] += busy
+            if busy > self.busy_max[core]:
+                self.busy_max[core] = busy
+            if busy >= HOT_CORE_THRESHOLD:
+                self.hot_ticks[core] += 1
+
+    def report(self):
+        if not self.samples:
+            return ""
+        means = [total / self.samples for total in self.busy_sum]
+        hottest = sorted(range(len(means)), key=lambda core: means[core], reverse=True)[:HOT_CORE_REPORT_COUNT]
+        lines = [f" *** Hot cores ({len(means)} cores, {self.samples} samples, "
+                 f"all-core mean {sum(means) / len(means):.1f}%) *** "]
+        lines.append("Core | Mean busy % | Max busy % | Samples >= " + f"{HOT_CORE_THRESHOLD:.0f}%")
+        for core in hottest:
+            lines.append(f"cpu{core} | {means[core]:.1f} | {self.busy_max[core]:.1f} | {self.hot_ticks[core]}")
+        return "\n".join(lines)
+
+
+
+@register_collector
+class PerCpuCollector(Collector):
+    name = "percpu"
+    title = "PerCPU"
+    requires_psutil = True
+
+    def __init__(self, **context):
+        self._previous = psutil.cpu_times(percpu=True)
+        self._previous_time = time.monotonic()
+        self.core_count = len(self._previous)
+        self.columns = [
+            f"cpu{core}.{field}" for core in range(self.core_count) for field in ("busy",) + PERCPU_MODES
+        ]
+        self.hot_cores = HotCoreSummary(self.core_count)
+
+    # A window under RATE_MIN_WINDOW_SECONDS spans a clock tick or none (every core 0% or 100%): keep the
+    # baseline and report nothing
+    def collect(self):
+        current, now = psutil.cpu_times(percpu=True), time.monotonic()
+        if now - self._previous_time < RATE_MIN_WINDOW_SECONDS:
+            return dict.fromkeys(self.columns)
+        row = []
+        for previous_core, current_core in zip(self._previous, current):
+            previous_total, _ = cpu_total_and_idle(previous_core)
+            current_total, _ = cpu_total_and_idle(current_core)
+            total_delta = current_total - previous_total
+            row.append(cpu_busy_percent(previous_core, current_core))
+            for mode in PERCPU_MODES:
+                mode_delta = getattr(current_core, mode, 0.0) - getattr(previous_core, mode, 0.0)
+                row.append(100.0 * mode_delta / total_delta if total_delta > 0 else 0.0)
+        self._previous, self._previous_time = current, now
+        self.hot_cores.update(row)
+        return dict(zip(self.columns, row))
+
+    def summary(self, metrics):
+        busy = {column.split(".", 1)[0]: value for column, value in metrics.items() if column.endswith(".busy")}
+        if None in busy.values():
+            return f"Per-CPU: {len(busy)} cores | N/A"
+        busiest = sorted(busy, key=busy.get, reverse=True)[:PERCPU_SUMMARY_CORES]
+        return f"Per-CPU: {len(busy)} cores | " + " | ".join(f"{core} {busy[core]:.1f}%" for core in busiest)
+
+    def report(self):
+        return self.hot_cores.report()
+
+
+# ------------------------------------------------------------
+# Collector Set | the selected collectors, each on its own cadence, merged into one timeline per tick
+#   A core collector not due this tick contributes its last reading to the row. Other collectors append to
+#   their own MetricSetStore only on the ticks they run. A collector is due once its period has elapsed,
+#   within a small tolerance.
+# ------------------------------------------------------------
+BACKOFF_BASE_SECONDS = 10.0
+BACKOFF_MAX_SECONDS = 3600.0
+
+
+class CollectorSet:
+    def __init__(self, log_dir, hostname, retention, retention_days, block_rows, flush_seconds, on_new_segment,
+                 clock=time.monotonic, **context):
+        self.log_dir = log_dir
+        self.hostname = hostname
+        self.retention = retention
+        self.retention_days = retention_days
+        self.store_kwargs = {"block_rows": block_rows, "flush_seconds": flush_seconds,
+                             "on_new_segment": on_new_segment}
+        self.context = context                                                          # Passed to each collector
+        self.periods = {}
+        self._clock = clock
+        self.active = {}                                                                # name -> (collector, store)
+        self._due = {}                                                                  # name -> monotonic due time
+        self.latest = {}                                                                # Core field -> last value
+        self.write = None                                                               # BackgroundWriter.submit
+        self._failures = {}                                                             # name -> consecutive failures
+        self._retry_at = {}                                                             # name -> monotonic retry time
+
+    # Starts newly selected collectors and closes deselected ones (startup and config reload);
+    # changed context (e.g. a new disk path) restarts them all
+    def configure(self, metrics, periods=None, **context):
+        if context and {**self.context, **context} != self.context:
+            self.context.update(context)
+            self.configure(())
+        self.periods = dict(periods or {})
+        for name in [name for name in self.active if name not in metrics]:
+            collector, store = self.active.pop(name)
+            self._due.pop(name, None)
+            self._failures.pop(name, None)
+            self._retry_at.pop(name, None)
+            for field in collector.schema if collector.core else ():
+                self.latest.pop(field, None)
+            collector.close()
+            if store is not None:
+                store.close()
+        for name in COLLECTORS:                                                         # Registry order, core first
+            if name not in metrics or name in self.active:
+                continue
+            cls = COLLECTORS[name]
+            if psutil is None and cls.requires_psutil:
+                print(f"WARNING: the {name} collector needs psutil; skipped")
+                continue
+            collector = cls(**self.context)
+            store = None
+            if not collector.core:
+                directory = os.path.join(self.log_dir, f"{collector.title}_History_{self.hostname}")
+                store = MetricSetStore(directory, self.hostname, **self.store_kwargs)
+                self.retention.add_policy(directory, self.retention_days)
+            self.active[name] = (collector, store)
+
+    def period(self, collector):
+        return self.periods.get(collector.name, collector.period_sec)
+
+    def is_due(self, collector, now):
+        period = self.period(collector)
+        if not period:
+            return True
+        due = self._due.get(collector.name)
+        if due is not None and now < due - min(0.1 * period, 1.0):
+            return False
+        self._due[collector.name] = now + period
+        return True
+
+    # [(collector, store)] due at monotonic time now, core collectors first; skip = names still busy
+    def due(self, now, skip=()):
+        return [(collector, store) for name, (collector, store) in self.active.items()
+                if name not in skip and self._retry_at.get(name, now) <= now and self.is_due(collector, now)]
+
+    # A failing collector sits out BACKOFF_BASE_SECONDS, doubling per consecutive failure up to
+    # BACKOFF_MAX_SECONDS, instead of being retried every tick. Returns the wait in seconds.
+    def record_failure(self, name, now):
+        failures = self._failures[name] = self._failures.get(name, 0) + 1
+        backoff = min(BACKOFF_BASE_SECONDS * 2 ** (failures - 1), BACKOFF_MAX_SECONDS)
+        self._retry_at[name] = now + backoff
+        return backoff
+
+    def record_success(self, name):
+        self._failures.pop(name, None)
+        self._retry_at.pop(name, None)
+
+    def backing_off(self, now):
+        return {name for name, retry_at in self._retry_at.items() if retry_at > now}
+
+    # Core readings update the row; other readings go to their store (through the writer when set).
+    # Returns the console line (None for core).
+    def record(self, collector, store, timestamp, metrics):
+        if collector.core:
+            self.latest.update(metrics)
+            return None
+        if self.write is not None:
+            self.write("metric_set", collector.name, timestamp, metrics)
+        else:
+            store.append(timestamp, metrics)
+        return collector.summary(metrics)
+
+    # Writer sink; readings of a collector deselected in the meantime are dropped
+    def append_metrics(self, name, timestamp, metrics):
+        collector, store = self.active.get(name, (None, None))
+        if store is not None:
+            store.append(timestamp, metrics)
+
+    # Core row: latest reading of each core field; fields in missing (failed / late / disabled) are N/A
+    def core_sample(self, timestamp, missing=()):
+        return MetricSample(timestamp, *(
+            None if field in missing else self.latest.get(field) for field in MetricSample._fields[1:]
+        ))
+
+    def reports(self):
+        return [text for text in (collector.report() for collector, _ in self.active.values()) if text]
+
+    def set_flush_policy(self, block_rows, flush_seconds):
+        self.store_kwargs.update(block_rows=block_rows, flush_seconds=flush_seconds)
+        for _, store in self.active.values():
+            if store is not None:
+                store.set_flush_policy(block_rows, flush_seconds)
+
+    def close(self):
+        self.configure(())
+
+
 # ------------------------------------------------------------
-def collect_metrics(os_type):
-    cpu = psutil.cpu_times_percent(interval=0.1, percpu=False)                          # Collection - CPU Usage
-    m_cpu_usage = f"{round(100.0 - cpu.idle)}%"
+# Collection Engine | asyncio: the collectors due on a tick run concurrently on a bounded worker pool under a
+#   per-tick deadline. A collector that misses it yields a partial sample (its core fields N/A, no line) and is
+#   not re-run until the overdue call returns; a late core reading then fills the next row, late other readings
+#   are dropped (their tick has been written). A collector that raises only blanks its own fields (status bits
+#   in the history row) and backs off (CollectorSet.record_failure). run() drives one tick synchronously; samples() is an async
+#   iterator over the tick grid for embedding in an asyncio service:
+#       async for result in engine.samples(TickScheduler(10.0)): ...
+# ------------------------------------------------------------
+COLLECT_WORKERS = 4
+TICK_DEADLINE_FRACTION = 0.5            # Share of the interval collectors may take ...
+TICK_DEADLINE_MAX_SECONDS = 5.0         # ... capped, so long intervals still surface a hung source quickly
+
+
+class TickResult(NamedTuple):
+    timestamp: float
+    sample: MetricSample                # Fields of failed / late / disabled core collectors are None
+    lines: list                         # Console / activity log lines of the other collectors
+    error: Optional[str]                # Core collector failures, for the Error Code column
+    late: tuple                         # Collectors that missed the deadline
+    status: int                         # Field status bitmask (see STATUS_KINDS)
+
+
+def tick_deadline(interval_sec):
+    return min(TICK_DEADLINE_FRACTION * interval_sec, TICK_DEADLINE_MAX_SECONDS)
+
+
+def consume_outcome(waiter):
+    if not waiter.cancelled():
+        waiter.exception()
+
+
+class CollectionEngine:
+    def __init__(self, collectors, deadline_sec, workers=COLLECT_WORKERS):
+        self.collectors = collectors
+        self.deadline_sec = deadline_sec
+        self.pool = WorkerPool(workers, name="fa-collect")
+        self.pending = {}                                                               # name -> overdue future
+        self.overruns = 0                                                               # Collections past the deadline
+        self.late_results = 0                                                           # ... that returned later
+        self._loop = None
+
+    # Names of overdue core collectors whose reading arrived since the last tick (fresh enough for this row)
+    def _settle_pending(self):
+        settled = set()
+        for name, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[name]
+            self.late_results += 1
+            collector, _ = self.collectors.active.get(name, (None, None))
+            if collector is not None and collector.core and future.exception() is None:
+                self.collectors.latest.update(future.result())
+                settled.add(name)
+        return settled
 
-    mem = psutil.virtual_memory()                                                       # Collection - Memory Usage
-    m_used_memory =f"{mem.used / (1024 ** 3):.2f} GB"
-    m_total_memory = f"{mem.total / (1024 ** 3):.2f} GB"
-    m_memory_percent = f"{mem.percent}%"
+    def _core_fields(self, names):
+        collectors = [self.collectors.active[name][0] for name in names if name in self.collectors.active]
+        return {field for collector in collectors if collector.core for field in collector.schema}
 
-    disk = psutil.disk_usage(get_disk_path(os_type))                                    # Collection - Disk Usage
-    m_used_disk = f"{disk.used / (1024 ** 3):.2f} GB"
-    m_total_disk = f"{disk.total / (1024 ** 3):.2f} GB"
-    m_disk_percent = f"{disk.percent}%"
+    async def collect(self, timestamp):
+        settled = self._settle_pending()
+        now = self.collectors._clock()
+        due = self.collectors.due(now, skip=self.pending)
+        futures = {collector.name: self.pool.submit(collector.collect) for collector, _ in due}  # Core queued first
+        if futures:
+            waiters = [asyncio.wrap_future(future) for future in futures.values()]
+            for waiter in waiters:                          # Outcome is read from futures; keep asyncio from
+                waiter.add_done_callback(consume_outcome)   # logging "exception was never retrieved"
+            await asyncio.wait(waiters, timeout=self.deadline_sec)
+        lines, late, errors, failed = [], [], [], set()
+        for collector, store in due:
+            future = futures[collector.name]
+            if not future.done():
+                if not future.cancel():                                                 # Running: wait it out
+                    self.pending[collector.name] = future
+                self.overruns += 1
+                late.append(collector.name)
+                continue
+            error_found = future.exception()
+            if error_found is not None:                                                 # Only this collector's fields
+                retry_sec = self.collectors.record_failure(collector.name, now)
+                message = f"{error_found} - retry in {retry_sec:.0f}s"
+                if collector.core:
+                    errors.append(f"{collector.name}: {message}")
+                    failed.add(collector.name)
+                else:
+                    lines.append(f"{collector.title}: N/A ({message})")
+                continue
+            self.collectors.record_success(collector.name)
+            line = self.collectors.record(collector, store, timestamp, future.result())
+            if line is not None:
+                lines.append(line)
+        late.extend(name for name in self.pending if name not in late)                 # Still busy from earlier
+        if late:
+            lines.append(f"Late: {', '.join(late)} (over the {self.deadline_sec:.2f}s tick deadline)")
 
-    boot_time = datetime.fromtimestamp(psutil.boot_time())                              # Collection - Uptime
-    uptime_days = (datetime.now() - boot_time).days    
-    m_uptime = f"{uptime_days} Days"
+        failed_fields = self._core_fields(failed)
+        late_fields = self._core_fields(name for name in late if name not in settled)
+        disabled_fields = self._core_fields(self.collectors.backing_off(now) - failed)
+        missing = failed_fields | late_fields | disabled_fields
+        sample = self.collectors.core_sample(timestamp, missing)
+        unavailable = {field for field in self._core_fields(self.collectors.active) - missing
+                       if getattr(sample, field) is None}
+        status = (field_status(failed_fields, "failed") | field_status(late_fields, "late")
+                  | field_status(disabled_fields, "disabled") | field_status(unavailable, "unavailable"))
+        return TickResult(timestamp, sample, lines, "; ".join(errors) or None, tuple(late), status)
 
-    return m_cpu_usage, m_used_memory, m_total_memory, m_memory_percent, m_used_disk, m_total_disk, m_disk_percent, m_uptime
+    # One tick from synchronous code (the main loop)
+    def run(self, timestamp):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.collect(timestamp))
+
+    async def samples(self, scheduler):
+        while scheduler.has_next():
+            await asyncio.sleep(scheduler.seconds_until_next())
+            if scheduler.wait_next() is None:
+                return
+            yield await self.collect(time.time())
+
+    def summary(self):
+        return (f"Collectors: {self.overruns} over the {self.deadline_sec:.2f}s deadline | "
+                f"Late results: {self.late_results}")
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+
+# ------------------------------------------------------------
+# Interval Parsing | "500ms", "10s", "1.5m", "2h"; a bare number is minutes
+# ------------------------------------------------------------
+INTERVAL_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_interval(text, default_unit="m"):
+    value = text.strip().lower()
+    unit = default_unit
+    for suffix in sorted(INTERVAL_UNITS, key=len, reverse=True):
+        if value.endswith(suffix):
+            value, unit = value[:-len(suffix)].strip(), suffix
+            break
+    seconds = float(value) * INTERVAL_UNITS[unit]
+    if not seconds > 0 or seconds == float("inf"):
+        raise ValueError(f"interval must be positive: {text!r}")
+    return seconds
 
 
 # -------------------------------------------------------------------------------------------------
-# User Input - Metric Collection Interval (mc_interval_min) and Script Total Runtime (st_runtime_hr)
+# User Input - Metric Collection Interval (mc_interval_sec) and Script Total Runtime (st_runtime_hr)
 # -------------------------------------------------------------------------------------------------
-def get_user_inputs_mci_sr():
+def get_user_inputs_mci_sr(mc_interval_sec=None, st_runtime_hr=None, ask_runtime=True):
+    # Only the values not already given by flags / config file are prompted for
+    if mc_interval_sec is None:
+        try:
+            mc_interval_sec = parse_interval(
+                input("Enter input on the metric collection interval (in min, or with unit e.g. 500ms, 10s, 2h): ")
+            )
+        except ValueError:
+            print("ERROR: Value must be a positive number of minutes or a duration such as 10s. ")
+            sys.exit(1)
+
+    if st_runtime_hr is None and ask_runtime:
+        try:
+            st_runtime_hr = float(input("Enter input on the script total runtime (in hour)? ").strip())
+            if st_runtime_hr <= 0:
+                raise ValueError
+        except ValueError:
+            print("ERROR: Runtime should be a positive integer. ")
+            sys.exit(1)
+
+    return mc_interval_sec, st_runtime_hr
+
+
+# ------------------------------------------------------------
+# Command Line & Config File | defaults < config file < command line flags
+#   config file: TOML (Python 3.11+) or INI, keys as the long flag names under a [collector] section
+# ------------------------------------------------------------
+@dataclass
+class CollectorConfig:
+    interval_sec: Optional[float] = None
+    duration_hr: Optional[float] = None
+    daemon: bool = False                # Run until stopped (no duration)
+    log_dir: Optional[str] = None
+    disk_path: Optional[str] = None
+    metrics: Tuple[str, ...] = METRIC_GROUPS
+    percpu: bool = ENABLE_PERCPU
+    retention_days: float = RETENTION_DAYS
+    flush_rows: int = HISTORY_FLUSH_ROWS
+    flush_seconds: float = HISTORY_FLUSH_SECONDS
+    csv: bool = False                   # Also append to the legacy Metric_History_csv_<host>.csv
+    retention_raw_days: float = RAW_RETENTION_DAYS
+    retention_1m_days: float = ROLLUP_TIERS[0].retention_days
+    retention_5m_days: float = ROLLUP_TIERS[1].retention_days
+    retention_1h_days: float = ROLLUP_TIERS[2].retention_days
+    sensor_pattern: Optional[str] = None   # Regex on process names for the sensor collector
+    backend: str = "auto"                  # Collection backend: auto, psutil or proc
+    periods: dict = field(default_factory=dict)    # Collector name -> cadence (s), overriding period_sec
+    write_queue: int = WRITE_QUEUE_JOBS    # Background writer queue bound ...
+    overflow: str = "drop-oldest"          # ... and what happens when it is full
+    config_path: Optional[str] = None
+
+
+def parse_duration(text):
+    if str(text).strip().lower() in ("0", "inf", "forever", "daemon"):
+        return None
+    return parse_interval(str(text), default_unit="h") / 3600
+
+
+def parse_metrics(text):
+    metrics = tuple(name.strip().lower() for name in str(text).split(",") if name.strip())
+    known = tuple(COLLECTORS)
+    unknown = [name for name in metrics if name not in known]
+    if unknown or not metrics:
+        raise ValueError(f"unknown metric(s) {', '.join(unknown) or text!r}; choose from {', '.join(known)}")
+    return metrics
+
+
+def parse_pattern(text):
     try:
-        mc_interval_min = int(input("Enter input on the metric collection interval (in min): ").strip())
-        if mc_interval_min <= 0:
-            raise ValueError
-    except ValueError:
-        print("ERROR: Value must be a positive integer. ")
-        sys.exit(1)
+        re.compile(text)
+    except re.error as error_found:
+        raise ValueError(f"invalid pattern {text!r}: {error_found}")
+    return text
+
+
+def parse_periods(text):
+    periods = {}
+    for item in str(text).split(","):
+        if not item.strip():
+            continue
+        name, separator, duration = item.partition("=")
+        name = name.strip().lower()
+        if not separator or name not in COLLECTORS:
+            raise ValueError(f"periods must look like disk=1m,uptime=5m with names from {', '.join(COLLECTORS)}: {item!r}")
+        periods[name] = parse_interval(duration, default_unit="s")
+    return periods
 
+
+def parse_write_queue(text):
     try:
-        st_runtime_hr = float(input("Enter input on the script total runtime (in hour)? ").strip())
-        if st_runtime_hr <= 0:
-            raise ValueError
+        jobs = int(str(text).strip())
     except ValueError:
-        print("ERROR: Runtime should be a positive integer. ")
-        sys.exit(1)
-    
-    return mc_interval_min, st_runtime_hr
+        raise ValueError(f"write queue size must be a whole number of jobs: {text!r}")
+    if jobs < 1:
+        raise ValueError(f"write queue size must be at least 1: {text!r}")
+    return jobs
+
+
+def parse_overflow(text):
+    policy = text.strip().lower()
+    if policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"unknown overflow policy {text!r}; choose from {', '.join(OVERFLOW_POLICIES)}")
+    return policy
+
+
+def parse_backend(text):
+    backend = text.strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {text!r}; choose from {', '.join(BACKENDS)}")
+    return backend
+
+
+def parse_timestamp(text):
+    for layout in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text.strip(), layout).timestamp()
+        except ValueError:
+            pass
+    raise ValueError(f"timestamp must look like 2025-12-23 02:00[:00]: {text!r}")
+
+
+def parse_bool(text):
+    value = str(text).strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"not a boolean: {text!r}")
+
+
+def load_config_file(path):
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML config files need Python 3.11+; use an .ini file instead")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        return data.get("collector", data)
+    parser = configparser.ConfigParser()
+    if not parser.read(path):
+        raise ValueError(f"cannot read config file {path}")
+    return dict(parser["collector"]) if parser.has_section("collector") else {}
+
+
+CONFIG_OPTIONS = {                      # key -> (CollectorConfig field, parser)
+    "interval": ("interval_sec", parse_interval),
+    "duration": ("duration_hr", parse_duration),
+    "daemon": ("daemon", parse_bool),
+    "log_dir": ("log_dir", str),
+    "disk_path": ("disk_path", str),
+    "metrics": ("metrics", parse_metrics),
+    "percpu": ("percpu", parse_bool),
+    "retention_days": ("retention_days", float),
+    "flush_rows": ("flush_rows", int),
+    "flush_seconds": ("flush_seconds", float),
+    "csv": ("csv", parse_bool),
+    "retention_raw_days": ("retention_raw_days", float),
+    "retention_1m_days": ("retention_1m_days", float),
+    "retention_5m_days": ("retention_5m_days", float),
+    "retention_1h_days": ("retention_1h_days", float),
+    "sensor_pattern": ("sensor_pattern", parse_pattern),
+    "backend": ("backend", parse_backend),
+    "periods": ("periods", parse_periods),
+    "write_queue": ("write_queue", parse_write_queue),
+    "overflow": ("overflow", parse_overflow),
+}
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Collect system health metrics (CPU, Memory, Disk, Uptime)")
+    parser.add_argument("--config", help="TOML or INI config file ([collector] section)")
+    parser.add_argument("--interval", help="collection interval: minutes, or with unit e.g. 500ms, 10s, 2h")
+    parser.add_argument("--duration", help="total runtime: hours, or with unit e.g. 30m; 0/inf runs until stopped")
+    parser.add_argument("--daemon", action="store_const", const="true", help="run until stopped")
+    parser.add_argument("--log-dir", dest="log_dir", help="activity log / history directory")
+    parser.add_argument("--disk-path", dest="disk_path", help="path whose disk usage is reported")
+    parser.add_argument("--metrics", help=f"comma separated subset of: {','.join(COLLECTORS)}")
+    parser.add_argument("--sensor-pattern", dest="sensor_pattern", metavar="REGEX",
+                        help="sensor collector: also track processes whose name matches this regex")
+    parser.add_argument("--backend", choices=BACKENDS, help="collection backend (default auto: /proc on Linux)")
+    parser.add_argument("--benchmark", nargs="?", type=int, const=BENCHMARK_TICKS, metavar="TICKS",
+                        help="time the core collectors per backend and exit")
+    parser.add_argument("--periods", metavar="NAME=DURATION,...",
+                        help="per-collector cadence, e.g. disk=1m,uptime=5m (default: each collector's own)")
+    parser.add_argument("--write-queue", dest="write_queue", help="background writer queue size (jobs)")
+    parser.add_argument("--overflow", choices=OVERFLOW_POLICIES, help="when the writer queue is full")
+    parser.add_argument("--percpu", action="store_const", const="true", help="record per-core CPU breakdown")
+    parser.add_argument("--retention-days", dest="retention_days", help="delete activity logs older than this")
+    for tier_name in ("raw",) + tuple(tier.name for tier in ROLLUP_TIERS):
+        parser.add_argument(f"--retention-{tier_name}-days", dest=f"retention_{tier_name}_days",
+                            help=f"keep {tier_name} history segments this long")
+    parser.add_argument("--flush-rows", dest="flush_rows", help="flush history after this many rows")
+    parser.add_argument("--flush-seconds", dest="flush_seconds", help="flush history after this many seconds")
+    parser.add_argument("--csv", action="store_const", const="true",
+                        help="also append rows to the legacy Metric_History_csv_<host>.csv")
+    parser.add_argument("--export-csv", dest="export_csv", metavar="PATH",
+                        help="export the columnar history to a CSV file and exit")
+    parser.add_argument("--from", dest="export_from", metavar="TIME",
+                        help="with --export-csv: first timestamp, e.g. '2025-12-23 02:00'")
+    parser.add_argument("--to", dest="export_to", metavar="TIME",
+                        help="with --export-csv: end timestamp (exclusive)")
+    parser.add_argument("--tier", choices=("raw",) + tuple(tier.name for tier in ROLLUP_TIERS), default="raw",
+                        help="with --export-csv: raw samples or a rollup tier")
+    return parser
+
+
+def resolve_config(args):
+    config = CollectorConfig(config_path=args.config)
+    layers = [load_config_file(args.config)] if args.config else []
+    layers.append({key: getattr(args, key) for key in CONFIG_OPTIONS if getattr(args, key, None) is not None})
+    for layer in layers:
+        for key, value in layer.items():
+            key = key.replace("-", "_")
+            if key not in CONFIG_OPTIONS:
+                raise ValueError(f"unknown config option: {key}")
+            if isinstance(value, (list, tuple)):                                        # TOML arrays, e.g. metrics
+                value = ",".join(map(str, value))
+            elif isinstance(value, dict):                                               # TOML tables, e.g. periods
+                value = ",".join(f"{name}={item}" for name, item in value.items())
+            field_name, parse = CONFIG_OPTIONS[key]
+            setattr(config, field_name, parse(str(value)))
+            if key == "duration" and config.duration_hr is None:                        # duration = 0 / inf
+                config.daemon = True
+    return config
+
+
+# ------------------------------------------------------------
+# Tick Scheduler | samples aligned to a time.monotonic() grid: start + n * interval
+# ------------------------------------------------------------
+class TickScheduler:
+    def __init__(self, interval_sec, duration_sec=None, clock=time.monotonic, sleep=time.sleep, interrupted=None):
+        self.interval_sec = interval_sec
+        self._clock = clock
+        self._sleep = sleep
+        self._interrupted = interrupted or (lambda: False)
+        self.origin = self.start = clock()
+        self.end = None if duration_sec is None else self.start + duration_sec
+        self.late_tolerance_sec = min(0.1 * interval_sec, 1.0)
+        self._next_index = 0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.missed_ticks = 0
+        self.max_lateness_sec = 0.0
+
+    def deadline(self, index):
+        return self.start + index * self.interval_sec
+
+    def has_next(self):
+        return self.end is None or self.deadline(self._next_index) < self.end
+
+    # New interval takes effect from the last fired tick, so the sample timeline has no gap or burst
+    def set_interval(self, interval_sec):
+        if self._next_index:
+            self.start, self._next_index = self.deadline(self._next_index - 1), 1
+        self.interval_sec = interval_sec
+        self.late_tolerance_sec = min(0.1 * interval_sec, 1.0)
+
+    def set_duration(self, duration_sec):
+        self.end = None if duration_sec is None else self.origin + duration_sec
+
+    def seconds_until_next(self):
+        return max(self.deadline(self._next_index) - self._clock(), 0.0)
+
+    # Blocks until the next grid deadline. Returns the lateness in seconds, or None once the run window is over
+    # or the wait was interrupted (the pending tick is kept, so calling again resumes the wait).
+    # Deadlines that already passed by a whole interval are skipped (counted as missed), never bunched up.
+    def wait_next(self):
+        if not self.has_next():
+            return None
+        deadline = self.deadline(self._next_index)
+        now = self._clock()
+        if now < deadline:
+            while now < deadline:
+                if self._interrupted():
+                    return None
+                self._sleep(deadline - now)
+                now = self._clock()
+            lateness = 0.0
+        else:
+            skipped = int((now - deadline) // self.interval_sec)
+            if skipped:
+                self.missed_ticks += skipped
+                self._next_index += skipped
+                if not self.has_next():
+                    return None
+                deadline = self.deadline(self._next_index)
+            lateness = now - deadline
+            if lateness > self.late_tolerance_sec:
+                self.late_ticks += 1
+            self.max_lateness_sec = max(self.max_lateness_sec, lateness)
+        self._next_index += 1
+        self.ticks += 1
+        return lateness
+
+    def summary(self):
+        return (f"Ticks: {self.ticks} | Late: {self.late_ticks} | Missed: {self.missed_ticks} | "
+                f"Max lateness: {self.max_lateness_sec:.3f}s")
+
+
+# ------------------------------------------------------------
+# Signal Handling | SIGTERM / SIGINT: stop and flush, SIGHUP: reload config file in place
+# ------------------------------------------------------------
+class SignalController:
+    def __init__(self):
+        self.wakeup = threading.Event()
+        self.stop_requested = False
+        self.reload_requested = False
+
+    def install(self):
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        if hasattr(signal, "SIGHUP"):                                                   # Not available on Windows
+            signal.signal(signal.SIGHUP, self._on_reload)
+
+    def _on_stop(self, signum, frame):
+        self.stop_requested = True
+        self.wakeup.set()
+
+    def _on_reload(self, signum, frame):
+        self.reload_requested = True
+        self.wakeup.set()
+
+    def interrupted(self):
+        return self.stop_requested or self.reload_requested
+
+    def sleep(self, seconds):
+        self.wakeup.wait(seconds)
+
+    def reload_handled(self):
+        self.reload_requested = False
+        if not self.stop_requested:
+            self.wakeup.clear()
+
+
+# --metrics plus the per-CPU collector when --percpu / ENABLE_PERCPU asks for it
+def selected_metrics(config):
+    if config.percpu and "percpu" not in config.metrics:
+        return config.metrics + ("percpu",)
+    return config.metrics
+
+
+# Re-reads the config file and command line; settings that need new files (log dir, backend, writer) wait for
+# a restart
+def reload_config(args, config):
+    try:
+        new_config = resolve_config(args)
+    except (OSError, ValueError) as error_found:
+        print(f"WARNING: config reload failed, keeping current settings: {error_found}")
+        return config
+    if new_config.interval_sec is None:                                                 # Came from the prompts
+        new_config.interval_sec = config.interval_sec
+    if new_config.duration_hr is None and not new_config.daemon:
+        new_config.duration_hr, new_config.daemon = config.duration_hr, config.daemon
+    for field_name in ("log_dir", "backend", "write_queue", "overflow"):
+        if getattr(new_config, field_name) != getattr(config, field_name):
+            print(f"WARNING: {field_name} change needs a restart; keeping {getattr(config, field_name)!r}")
+            setattr(new_config, field_name, getattr(config, field_name))
+    print(f"Config reloaded: interval {new_config.interval_sec}s, metrics {','.join(new_config.metrics)}, "
+          f"retention {new_config.retention_days} days")
+    return new_config
 
 
 # ------------------------------------------------------------
 # Main Execution
 # ------------------------------------------------------------
-def main():
-    mc_interval_min, st_runtime_hr = get_user_inputs_mci_sr()
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    try:
+        config = resolve_config(args)
+    except (OSError, ValueError) as error_found:
+        print(f"ERROR: {error_found}")
+        sys.exit(2)
+
+    if args.export_csv:
+        store_directory = os.path.join(config.log_dir or get_log_directory(get_os_type()),
+                                       f"Metric_History_{get_hostname()}")
+        try:
+            start_ts, end_ts = (None if text is None else parse_timestamp(text)
+                                for text in (args.export_from, args.export_to))
+        except ValueError as error_found:
+            print(f"ERROR: {error_found}")
+            sys.exit(2)
+        if args.tier == "raw":
+            rows = export_history_csv(store_directory, args.export_csv, start_ts, end_ts)
+        else:
+            tier = next(tier for tier in ROLLUP_TIERS if tier.name == args.tier)
+            rows = export_rollup_csv(
+                rollup_directory(os.path.dirname(store_directory), tier.name, get_hostname()),
+                args.export_csv, tier, start_ts, end_ts,
+            )
+        print(f"Exported {rows} rows to {args.export_csv}")
+        return
 
+    if args.benchmark:
+        run_benchmark(args.benchmark, config.disk_path or get_disk_path(get_os_type()))
+        return
+
+    if config.interval_sec is None or (config.duration_hr is None and not config.daemon):
+        if not sys.stdin.isatty():
+            print("ERROR: --interval and --duration (or --daemon) are required when not run from a terminal.")
+            sys.exit(2)
+        config.interval_sec, config.duration_hr = get_user_inputs_mci_sr(
+            config.interval_sec, config.duration_hr, ask_runtime=not config.daemon
+        )
+    try:
+        backend = create_backend(config.backend)
+    except (OSError, ValueError) as error_found:
+        print(f"ERROR: {error_found}")
+        sys.exit(2)
     tag_os_type = get_os_type()
     tag_os_version = get_os_version()
     tag_hostname = get_hostname()
     tag_python_version = get_python_version()
 
-    log_dir = get_log_directory(tag_os_type)
+    log_dir = config.log_dir or get_log_directory(tag_os_type)
 
     if not check_permissions(log_dir):
         sys.exit(1)
 
-    metrics_history_csv = os.path.join(log_dir, f"Metric_History_csv_{tag_hostname}.csv")                                              
-    
+    retention = RetentionIndex(log_dir, retention_days=config.retention_days)
+    retention.seed()
 
-# Capturing existing CSV row count (excluding header)
-    if os.path.exists(metrics_history_csv):
-        csv_start_row_count = len(pd.read_csv(metrics_history_csv))
-    else:
-        csv_start_row_count = 0
+    def track_segment(path):
+        retention.track(path)
+        retention.track(column_index_path(path))
+
+# Columnar history store remembers where this run started, so the report never re-reads older rows
+    history_store = HistoryStore(
+        os.path.join(log_dir, f"Metric_History_{tag_hostname}"),
+        tag_hostname,
+        block_rows=config.flush_rows,
+        flush_seconds=config.flush_seconds,
+        on_new_segment=track_segment,
+    )
+    rollups = RollupAggregator(
+        log_dir, tag_hostname, block_rows=config.flush_rows, flush_seconds=config.flush_seconds,
+        on_new_segment=track_segment,
+    )
+    retention.add_policy(history_store.directory, config.retention_raw_days)
+    collectors = CollectorSet(
+        log_dir, tag_hostname, retention, config.retention_raw_days,
+        block_rows=config.flush_rows, flush_seconds=config.flush_seconds, on_new_segment=track_segment,
+        backend=backend, stat_pool=WorkerPool(),
+    )
 
-# Script duration and Interval calculation
-    start_time_script = time.time()
-    end_time_script = start_time_script + (st_runtime_hr * 3600 )
+    def collector_context(config):
+        disk_path = config.disk_path or get_disk_path(tag_os_type)
+        return {"disk_path": disk_path, "sensor_root": disk_path, "sensor_pattern": config.sensor_pattern}
 
-    while time.time() < end_time_script:
+    collectors.configure(selected_metrics(config), config.periods, **collector_context(config))
+    engine = CollectionEngine(collectors, tick_deadline(config.interval_sec))
+    for tier in ROLLUP_TIERS:
+        retention.add_policy(rollups.stores[tier.name].directory, getattr(config, f"retention_{tier.name}_days"))
+
+    history_writer = None
+    if config.csv:
+        metrics_history_csv = os.path.join(log_dir, f"Metric_History_csv_{tag_hostname}.csv")
+        archive_legacy_history(metrics_history_csv, HISTORY_CSV_COLUMNS)
+        history_writer = HistoryWriter(
+            metrics_history_csv, HISTORY_CSV_COLUMNS, flush_rows=config.flush_rows, flush_seconds=config.flush_seconds
+        )
+
+    activity_columns = DISPLAY_COLUMNS + ["Error Code"]
+    activity_log = ActivityLog(
+        log_dir,
+        tag_hostname,
+        activity_log_header(
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            tag_hostname, tag_os_type, tag_os_version, tag_python_version, activity_columns,
+        ),
+        on_new_segment=retention.track,
+    )
+
+# All file writes go through one background writer thread; sampling only queues them
+    def write_tick(timestamp, sample_values, status, log_lines):
+        sample = None if sample_values is None else MetricSample(*sample_values)
+        activity_log.write_entries(timestamp, log_lines, flush=False)
+        history_store.append(timestamp, sample, status)
+        rollups.add(timestamp, sample)
+        if history_writer is not None:
+            history_writer.write_row(history_row(timestamp, tag_hostname, sample))
+
+    writer = BackgroundWriter(
+        config.write_queue, config.overflow, os.path.join(log_dir, f".SystemHealth_Spill_{tag_hostname}.jsonl")
+    )
+    writer.register("tick", write_tick)
+    writer.register("metric_set", collectors.append_metrics)
+    writer.register("retention", retention.maybe_run)
+    writer.batch_hooks.append(activity_log.flush)
+    writer.start()
+    collectors.write = writer.submit
+    dropped_reported = 0
+
+# Script duration and Interval calculation (drift-free monotonic grid)
+    signals = SignalController()
+    signals.install()
+    scheduler = TickScheduler(
+        config.interval_sec,
+        None if config.daemon else config.duration_hr * 3600,
+        sleep=signals.sleep,
+        interrupted=signals.interrupted,
+    )
+    missed_reported = 0
+
+    while True:
+        if scheduler.wait_next() is None:
+            if signals.reload_requested and not signals.stop_requested:
+                writer.drain()                                                          # Stores change below
+                new_config = reload_config(args, config)
+                if new_config.interval_sec != config.interval_sec:
+                    scheduler.set_interval(new_config.interval_sec)
+                    engine.deadline_sec = tick_deadline(new_config.interval_sec)
+                scheduler.set_duration(None if new_config.daemon else new_config.duration_hr * 3600)
+                if new_config.retention_days != config.retention_days:
+                    retention.set_retention_days(new_config.retention_days)
+                if new_config.retention_raw_days != config.retention_raw_days:
+                    retention.set_retention_days(new_config.retention_raw_days, history_store.directory)
+                for tier in ROLLUP_TIERS:
+                    tier_days = getattr(new_config, f"retention_{tier.name}_days")
+                    if tier_days != getattr(config, f"retention_{tier.name}_days"):
+                        retention.set_retention_days(tier_days, rollups.stores[tier.name].directory)
+                history_store.set_flush_policy(new_config.flush_rows, new_config.flush_seconds)
+                rollups.set_flush_policy(new_config.flush_rows, new_config.flush_seconds)
+                collectors.set_flush_policy(new_config.flush_rows, new_config.flush_seconds)
+                collectors.configure(selected_metrics(new_config), new_config.periods,
+                                     **collector_context(new_config))
+                if history_writer is not None:
+                    history_writer.flush_rows = new_config.flush_rows
+                    history_writer.flush_seconds = new_config.flush_seconds
+                config = new_config
+                signals.reload_handled()
+                continue
+            if signals.stop_requested:
+                print("\nStop requested - flushing and closing history")
+            break
         error_code = "None"
+        if scheduler.missed_ticks > missed_reported:
+            print(f"WARNING: {scheduler.missed_ticks - missed_reported} sample(s) missed - collection overran the interval")
+            missed_reported = scheduler.missed_ticks
         now_timestamp = datetime.now()
-        display_timestamp = now_timestamp.strftime("%Y-%m-%d %H:%M:%S")
-        file_timestamp = now_timestamp.strftime("%Y-%m-%d_%H-%M-%S")
-        
-        log_file = os.path.join(
-            log_dir,
-            f"{file_timestamp}_{tag_hostname}_SystemHealth_Log.txt"                                 # Activity LogFile Name
-        )
-        try:
-            (
-                m_cpu_usage,
-                m_used_memory,
-                m_total_memory,
-                m_memory_percent,
-                m_used_disk,
-                m_total_disk,
-                m_disk_percent,
-                m_uptime,
-            ) = collect_metrics(tag_os_type)
-        except Exception as error_found:
-            error_code = str(error_found)
-            m_cpu_usage = m_used_memory = m_total_memory = m_memory_percent = "N/A"
-            m_used_disk = m_total_disk = m_disk_percent = m_uptime = "N/A"
 
-    # --------------------------------------------------------
-    # DataFrame Creation
-    # --------------------------------------------------------
-        metrics_data = {
-            "Timestamp": display_timestamp,
-            "Hostname": tag_hostname,
-            "CPU usage %": m_cpu_usage,
-            "Used Memory": m_used_memory,
-            "Total Memory": m_total_memory,
-            "Memory usage %": m_memory_percent,
-            "Used Disk Space": m_used_disk,
-            "Total Disk Space": m_total_disk,
-            "Disk usage %": m_disk_percent,
-            "uptime": m_uptime
-        }
+        result = engine.run(now_timestamp.timestamp())
+        sample, extra_lines = result.sample, result.lines
+        if result.error is not None:
+            error_code = result.error
 
-        metrics_df = pd.DataFrame([metrics_data])   
-    
     # --------------------------------------------------------
     # Console Output
     # --------------------------------------------------------
-        header_line = " | ".join(metrics_df.columns)
-        value_line = " | ".join(metrics_df.iloc[0].astype(str).values)
+        header_line = " | ".join(DISPLAY_COLUMNS)
+        value_line = " | ".join(format_sample(now_timestamp.timestamp(), tag_hostname, sample))
 
         print(header_line)
         print(value_line)
+        for extra_line in extra_lines:
+            print(extra_line)
     # --------------------------------------------------------
-    # Write Log File
+    # Queue Activity Log Entry + History Row (rotating daily log segment, columnar store, optional legacy CSV)
     # --------------------------------------------------------
-        with open(log_file, "w") as lf:
-            lf.write("=" * 90 + "\n")
-            lf.write("\nFA Sensor Health Log\n")
-            lf.write("=" * 90 + "\n")
-            lf.write(f"Script Run Time : {display_timestamp}\n")
-            lf.write(f"Hostname        : {tag_hostname}\n")
-            lf.write(f"OS Type         : {tag_os_type}\n")
-            lf.write(f"OS Version      : {tag_os_version}\n")
-            lf.write(f"Python Version  : {tag_python_version}\n\n")
-            lf.write(header_line + "\n")
-            lf.write(value_line + "\n\n")
-            lf.write(f"Error Code: " + error_code + "\n")
+        writer.submit(
+            "tick", now_timestamp.timestamp(), sample, result.status,
+            [value_line + " | " + error_code] + ["    " + extra_line for extra_line in extra_lines],
+        )
+        if writer.dropped > dropped_reported:
+            print(f"WARNING: {writer.dropped - dropped_reported} write(s) dropped - writer queue full")
+            dropped_reported = writer.dropped
 
-    # --------------------------------------------------------
-    # Write CSV File (with Header if ONLY file do not exists)
-    # --------------------------------------------------------
-        write_header = not os.path.exists(metrics_history_csv)
-        metrics_df.to_csv(metrics_history_csv, mode="a", header=write_header, index=False)
-    
-        cleanup_old_logs(log_dir)
+        writer.submit("retention")
     
-        if time.time() + (mc_interval_min * 60) >= end_time_script:
+        if not scheduler.has_next():
             print("\nExiting Metric collection")
             break
         else:
             print("\nScript Run is in Progress ..." )
-    
-        time.sleep(mc_interval_min * 60)
     # --------------------------------------------------------
     # FINAL OUTPUT
     # --------------------------------------------------------
+    writer.close()                                                                      # Drains queued writes first
+    engine.close()
+    collector_reports = collectors.reports()
+    collectors.close()
+    backend.close()
+    history_store.close()
+    rollups.close()
+    if history_writer is not None:
+        history_writer.close()
+    activity_log.close()
     print(f"\nThe Script has completed collecting metrics\n")
-    
-    
-    final_updated_df = pd.read_csv(metrics_history_csv)
-    delta_row_added_df = final_updated_df.iloc[csv_start_row_count:]
-    
-    print(f" *** Metrics collected *** ")
-    print(delta_row_added_df.to_string(index=False))
-    #print(pd.read_csv(metrics_history_csv).to_string(index=False))
+    print(scheduler.summary())
+    print(engine.summary())
+    print(writer.summary() + "\n")
+
+    print_run_report(history_store.directory, history_store.run_start)
+    for report in collector_reports:
+        print("\n" + report)
 
 if __name__ == "__main__":
         main()
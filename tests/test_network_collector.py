@@ -0,0 +1,58 @@
+import os
+import sys
+from collections import namedtuple
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fa_metrics_systemhealth_AFTERSubm as health  # noqa: E402
+
+# psutil's field order: bytes and packets sent before received, errors before drops
+snetio = namedtuple("snetio", "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout")
+
+
+class FakePsutil:
+    def __init__(self, counters):
+        self.counters = counters
+
+    def net_io_counters(self, pernic=False):
+        return self.counters
+
+
+@pytest.fixture
+def fake_psutil(monkeypatch):
+    fake = FakePsutil({"eth0": snetio(0, 0, 0, 0, 0, 0, 0, 0), "lo": snetio(0, 0, 0, 0, 0, 0, 0, 0)})
+    monkeypatch.setattr(health, "psutil", fake)
+    clock = iter([100.0, 101.0])
+    monkeypatch.setattr(health.time, "monotonic", lambda: next(clock))
+    return fake
+
+
+def test_network_rates_are_read_by_counter_name(fake_psutil):
+    collector = health.NetworkCollector()
+    fake_psutil.counters = {
+        "eth0": snetio(bytes_sent=50, bytes_recv=1000, packets_sent=2, packets_recv=10,
+                       errin=4, errout=5, dropin=3, dropout=6),
+        "lo": snetio(9, 9, 9, 9, 9, 9, 9, 9),
+    }
+    metrics = collector.collect()
+    assert metrics == {
+        "eth0.rx_bytes_per_sec": 1000.0,
+        "eth0.tx_bytes_per_sec": 50.0,
+        "eth0.rx_packets_per_sec": 10.0,
+        "eth0.tx_packets_per_sec": 2.0,
+        "eth0.rx_drops_per_sec": 3.0,
+        "eth0.tx_drops_per_sec": 6.0,
+        "eth0.rx_errors_per_sec": 4.0,
+        "eth0.tx_errors_per_sec": 5.0,
+    }
+
+
+def test_network_start_up_window_keeps_the_baseline(fake_psutil, monkeypatch):
+    clock = iter([100.0, 100.005, 101.0])
+    monkeypatch.setattr(health.time, "monotonic", lambda: next(clock))
+    collector = health.NetworkCollector()
+    fake_psutil.counters = {"eth0": snetio(10, 1000, 1, 10, 0, 0, 0, 0)}
+    assert set(collector.collect().values()) == {None}
+    assert collector.collect()["eth0.rx_bytes_per_sec"] == 1000.0